@@ -10,6 +10,7 @@ from typing import Dict, List, Optional, Any
 import logging
 from datetime import datetime, timedelta
 import json
+import threading
 import time
 from dataclasses import dataclass
 import yaml
@@ -19,7 +20,7 @@ import os
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class EnergyPriceData:
     """Real-time energy price data structure"""
     region: str
@@ -34,7 +35,7 @@ class EnergyPriceData:
     carbon_intensity_gco2_kwh: float
     data_source: str
 
-@dataclass
+@dataclass(slots=True)
 class RenewableEnergyData:
     """Renewable energy generation data"""
     region: str
@@ -66,6 +67,9 @@ class EnergyDataConnector:
             'User-Agent': 'CarbonSiteAI/1.0 (Energy Data Connector)'
         })
         
+        # Guards the per-API last_request stamps shared by concurrent callers
+        self._rate_limit_lock = threading.Lock()
+        
         # API endpoints and configurations
         self.apis = {
             'entsoe_transparency': {
@@ -176,10 +180,12 @@ class EnergyDataConnector:
         if not api_config:
             return False
         
-        if api_config['last_request'] is None:
+        with self._rate_limit_lock:
+            last_request = api_config['last_request']
+        if last_request is None:
             return True
         
-        time_since_last = datetime.now() - api_config['last_request']
+        time_since_last = datetime.now() - last_request
         max_requests_per_second = api_config['rate_limit'] / 3600
         
         return time_since_last.total_seconds() >= (1 / max_requests_per_second)
@@ -187,7 +193,8 @@ class EnergyDataConnector:
     def _update_rate_limit(self, api_name: str) -> None:
         """Update API rate limit tracking"""
         if api_name in self.apis:
-            self.apis[api_name]['last_request'] = datetime.now()
+            with self._rate_limit_lock:
+                self.apis[api_name]['last_request'] = datetime.now()
     
     def get_eu_power_prices(self, 
                            country: str = None,
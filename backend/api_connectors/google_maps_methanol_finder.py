@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, Tuple
 import logging
 from dataclasses import dataclass
 import os
+from collections import Counter
 from math import radians, cos, sin, asin, sqrt
 
 # Configure logging
@@ -364,9 +365,7 @@ class GoogleMapsMethanolFinder:
         }
         
         # Business type distribution
-        business_types = {}
-        for buyer in buyers:
-            business_types[buyer.business_type] = business_types.get(buyer.business_type, 0) + 1
+        business_types = dict(Counter(buyer.business_type for buyer in buyers))
         
         # Demand estimation
         total_estimated_demand = 0
@@ -10,14 +10,16 @@ from typing import Dict, List, Optional, Any
 import logging
 from datetime import datetime, timedelta
 import json
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from operator import attrgetter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class FacilityData:
     """Real-time facility data structure"""
     facility_id: str
@@ -35,6 +37,85 @@ class FacilityData:
     last_updated: datetime
     data_source: str
 
+def _is_int(value) -> bool:
+    """True for Python/NumPy integers, excluding bools"""
+    return isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+
+class FacilityTable:
+    """Column-oriented (struct-of-arrays) store of FacilityData records"""
+    
+    FIELDS = tuple(field.name for field in fields(FacilityData))
+    NUMERIC_FIELDS = frozenset({
+        'latitude', 'longitude', 'co2_emissions_tpy', 'co2_concentration',
+        'power_consumption_mwh', 'renewable_energy_share'
+    })
+    
+    def __init__(self, columns: Dict[str, np.ndarray], int_masks: Dict[str, np.ndarray] = None):
+        self.columns = columns
+        # Numeric columns mixing ints and floats are stored as float64; the mask marks the int entries
+        self.int_masks = int_masks or {}
+    
+    @classmethod
+    def from_facilities(cls, facilities: List[FacilityData]) -> 'FacilityTable':
+        """Build a table from facility records in a single pass"""
+        
+        rows = list(map(attrgetter(*cls.FIELDS), facilities))
+        values = zip(*rows) if rows else ((),) * len(cls.FIELDS)
+        columns = {}
+        int_masks = {}
+        for name, column in zip(cls.FIELDS, values):
+            if name in cls.NUMERIC_FIELDS:
+                is_int = np.fromiter(map(_is_int, column), dtype=bool, count=len(column))
+                if len(column) and is_int.all():
+                    columns[name] = np.array(column, dtype=np.int64)
+                else:
+                    columns[name] = np.array(column, dtype=np.float64)
+                    if is_int.any():
+                        int_masks[name] = is_int
+            else:
+                columns[name] = np.empty(len(column), dtype=object)
+                columns[name][:] = column
+        return cls(columns, int_masks)
+    
+    def __len__(self) -> int:
+        return len(self.columns['facility_id'])
+    
+    def __getitem__(self, key):
+        """Column by name, FacilityData view by position, or sub-table by mask/slice"""
+        if isinstance(key, str):
+            return self.columns[key]
+        if isinstance(key, (int, np.integer)):
+            return FacilityData(*(self._value(name, key) for name in self.FIELDS))
+        return FacilityTable(
+            {name: column[key] for name, column in self.columns.items()},
+            {name: mask[key] for name, mask in self.int_masks.items()}
+        )
+    
+    def _value(self, name: str, i: int):
+        """Python value of one cell, restoring ints stored in a float64 column"""
+        value = self.columns[name][i]
+        if isinstance(value, np.generic):
+            value = value.item()
+        mask = self.int_masks.get(name)
+        return int(value) if mask is not None and mask[i] else value
+    
+    def column_values(self, name: str) -> list:
+        """Column as a list of Python values, with each entry in its original int/float type"""
+        values = self.columns[name].tolist()
+        mask = self.int_masks.get(name)
+        if mask is not None:
+            for i in np.flatnonzero(mask).tolist():
+                values[i] = int(values[i])
+        return values
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+    
+    def to_frame(self, columns: List[str] = None) -> pd.DataFrame:
+        """Return the selected columns as a DataFrame sharing the table's arrays"""
+        return pd.DataFrame({name: self.columns[name] for name in (columns or self.FIELDS)}, copy=False)
+
 class IndustrialDataConnector:
     """Connector for industrial facility and emissions data"""
     
@@ -45,6 +126,9 @@ class IndustrialDataConnector:
             'User-Agent': 'CarbonSiteAI/1.0 (Industrial Data Connector)'
         })
         
+        # Guards the per-API last_request stamps shared by concurrent callers
+        self._rate_limit_lock = threading.Lock()
+        
         # API endpoints and configurations
         self.apis = {
             'epa_facility_registry': {
@@ -76,10 +160,12 @@ class IndustrialDataConnector:
         if not api_config:
             return False
         
-        if api_config['last_request'] is None:
+        with self._rate_limit_lock:
+            last_request = api_config['last_request']
+        if last_request is None:
             return True
         
-        time_since_last = datetime.now() - api_config['last_request']
+        time_since_last = datetime.now() - last_request
         max_requests_per_second = api_config['rate_limit'] / 3600
         
         return time_since_last.total_seconds() >= (1 / max_requests_per_second)
@@ -87,7 +173,8 @@ class IndustrialDataConnector:
     def _update_rate_limit(self, api_name: str) -> None:
         """Update API rate limit tracking"""
         if api_name in self.apis:
-            self.apis[api_name]['last_request'] = datetime.now()
+            with self._rate_limit_lock:
+                self.apis[api_name]['last_request'] = datetime.now()
     
     def get_epa_facility_data(self, 
                              state: str = None, 
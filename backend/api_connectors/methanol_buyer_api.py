@@ -7,16 +7,32 @@ Real-time data collection for methanol offtake markets
 import requests
 import pandas as pd
 import json
+import sys
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 from dataclasses import dataclass
 
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Same opt-in switch as the financial model's on-disk analysis cache
+_CACHE_DIR_ENV = 'CARBONSITE_CACHE_DIR'
+
 @dataclass
 class MethanolBuyer:
     """Data structure for methanol buyer information"""
@@ -41,6 +57,35 @@ class MethanolMarket:
     last_updated: datetime
     data_source: str
 
+def _write_excel_sheets(filename: str, sheets: Dict[str, pd.DataFrame]) -> None:
+    """Stream DataFrames to an Excel workbook row by row
+    
+    Uses xlsxwriter in constant-memory mode when available (rows and shared
+    strings are flushed to temp files as they are written), otherwise an
+    openpyxl write-only workbook. Both avoid building an in-memory cell tree.
+    """
+    if xlsxwriter is not None:
+        workbook = xlsxwriter.Workbook(filename, {
+            'constant_memory': True,
+            'tmpdir': tempfile.gettempdir()
+        })
+        for sheet_name, df in sheets.items():
+            worksheet = workbook.add_worksheet(sheet_name)
+            worksheet.write_row(0, 0, df.columns)
+            for row_idx, row in enumerate(df.itertuples(index=False, name=None), start=1):
+                worksheet.write_row(row_idx, 0, row)
+        workbook.close()
+    else:
+        from openpyxl import Workbook
+        
+        workbook = Workbook(write_only=True)
+        for sheet_name, df in sheets.items():
+            worksheet = workbook.create_sheet(sheet_name)
+            worksheet.append(list(df.columns))
+            for row in df.itertuples(index=False, name=None):
+                worksheet.append(row)
+        workbook.save(filename)
+
 class MethanolBuyerConnector:
     """Connector for real-time methanol buyer and market data"""
     
@@ -75,9 +120,18 @@ class MethanolBuyerConnector:
             }
         }
         
-        # Cache for storing fetched data
-        self.cache = {}
-        self.cache_duration = timedelta(hours=24)
+        # Cache for storing fetched data; persisted to disk only when CARBONSITE_CACHE_DIR
+        # names a directory and diskcache is installed
+        self.cache_duration = 24 * 60 * 60  # 24 hours in seconds
+        cache_dir = os.environ.get(_CACHE_DIR_ENV)
+        self._disk_cache = bool(cache_dir) and diskcache is not None
+        if self._disk_cache:
+            self.cache = diskcache.Cache(
+                os.path.join(cache_dir, 'methanol_buyers'),
+                size_limit=2 ** 30
+            )
+        else:
+            self.cache = {}
     
     def _rate_limit_check(self, source: str) -> bool:
         """Check if rate limit allows request"""
@@ -94,16 +148,34 @@ class MethanolBuyerConnector:
         
         return False
     
+    def _get_cached(self, cache_key: str) -> Optional[Any]:
+        """Return cached data if present and not expired"""
+        if self._disk_cache:
+            # Expiry is enforced by diskcache itself
+            return self.cache.get(cache_key)
+        
+        if cache_key in self.cache:
+            cache_time, cache_data = self.cache[cache_key]
+            if time.monotonic() - cache_time < self.cache_duration:
+                return cache_data
+        return None
+    
+    def _set_cached(self, cache_key: str, data: Any) -> None:
+        """Store data in the cache"""
+        if self._disk_cache:
+            self.cache.set(cache_key, data, expire=self.cache_duration)
+        else:
+            self.cache[cache_key] = (time.monotonic(), data)
+    
     def get_german_chemical_companies(self) -> List[MethanolBuyer]:
         """Get German chemical companies that use methanol"""
         
         # Check cache first
         cache_key = 'german_chemical_companies'
-        if cache_key in self.cache:
-            cache_time, cache_data = self.cache[cache_key]
-            if datetime.now() - cache_time < self.cache_duration:
-                logger.info("Using cached German chemical companies data")
-                return cache_data
+        cache_data = self._get_cached(cache_key)
+        if cache_data is not None:
+            logger.info("Using cached German chemical companies data")
+            return cache_data
         
         logger.info("Fetching fresh German chemical companies data")
         
@@ -196,19 +268,19 @@ class MethanolBuyerConnector:
         for company_data in companies_data:
             buyer = MethanolBuyer(
                 company_name=company_data['company_name'],
-                location=company_data['location'],
+                location=sys.intern(company_data['location']),
                 coordinates=company_data['coordinates'],
                 methanol_demand_kt=company_data['methanol_demand_kt'],
-                primary_use=company_data['primary_use'],
+                primary_use=sys.intern(company_data['primary_use']),
                 contact_info=company_data['contact_info'],
                 last_updated=datetime.now(),
-                data_source=company_data['data_source'],
+                data_source=sys.intern(company_data['data_source']),
                 reliability_score=company_data['reliability_score']
             )
             buyers.append(buyer)
         
         # Cache the results
-        self.cache[cache_key] = (datetime.now(), buyers)
+        self._set_cached(cache_key, buyers)
         
         return buyers
     
@@ -216,11 +288,10 @@ class MethanolBuyerConnector:
         """Get methanol market data for specific region"""
         
         cache_key = f'methanol_market_{region}'
-        if cache_key in self.cache:
-            cache_time, cache_data = self.cache[cache_key]
-            if datetime.now() - cache_time < self.cache_duration:
-                logger.info(f"Using cached methanol market data for {region}")
-                return cache_data
+        cache_data = self._get_cached(cache_key)
+        if cache_data is not None:
+            logger.info(f"Using cached methanol market data for {region}")
+            return cache_data
         
         logger.info(f"Fetching fresh methanol market data for {region}")
         
@@ -257,7 +328,7 @@ class MethanolBuyerConnector:
             )
         
         # Cache the results
-        self.cache[cache_key] = (datetime.now(), market_data)
+        self._set_cached(cache_key, market_data)
         
         return market_data
     
@@ -265,11 +336,10 @@ class MethanolBuyerConnector:
         """Get methanol applications and market breakdown"""
         
         cache_key = 'methanol_applications'
-        if cache_key in self.cache:
-            cache_time, cache_data = self.cache[cache_key]
-            if datetime.now() - cache_time < self.cache_duration:
-                logger.info("Using cached methanol applications data")
-                return cache_data
+        cache_data = self._get_cached(cache_key)
+        if cache_data is not None:
+            logger.info("Using cached methanol applications data")
+            return cache_data
         
         logger.info("Fetching fresh methanol applications data")
         
@@ -332,7 +402,7 @@ class MethanolBuyerConnector:
         }
         
         # Cache the results
-        self.cache[cache_key] = (datetime.now(), applications)
+        self._set_cached(cache_key, applications)
         
         return applications
     
@@ -387,11 +457,21 @@ class MethanolBuyerConnector:
             }
         }
         
+        # Cheapest mode; ties resolve in rail, road, barge order
+        rail_cost = transport_options['rail']['total_cost']
+        road_cost = transport_options['road']['total_cost']
+        barge_cost = transport_options['barge']['total_cost']
+        if rail_cost <= road_cost and rail_cost <= barge_cost:
+            recommended_transport = 'rail'
+        elif road_cost <= barge_cost:
+            recommended_transport = 'road'
+        else:
+            recommended_transport = 'barge'
+        
         return {
             'distance_km': round(distance_km, 1),
             'transport_options': transport_options,
-            'recommended_transport': min(transport_options.items(), 
-                                      key=lambda x: x[1]['total_cost'])[0]
+            'recommended_transport': recommended_transport
         }
     
     def get_offtake_agreement_templates(self) -> Dict[str, str]:
@@ -419,49 +499,59 @@ class MethanolBuyerConnector:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f'methanol_buyer_analysis_{timestamp}.xlsx'
             
-            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                # Buyers sheet
-                buyers_df = pd.DataFrame([
-                    {
-                        'Company': b.company_name,
-                        'Location': b.location,
-                        'Latitude': b.coordinates[0],
-                        'Longitude': b.coordinates[1],
-                        'Methanol Demand (kt/year)': b.methanol_demand_kt,
-                        'Primary Use': b.primary_use,
-                        'Contact': b.contact_info,
-                        'Data Source': b.data_source,
-                        'Reliability Score': b.reliability_score
-                    } for b in buyers
-                ])
-                buyers_df.to_excel(writer, sheet_name='Methanol Buyers', index=False)
-                
-                # Market data sheet
-                market_df = pd.DataFrame([{
-                    'Region': market_data.region,
-                    'Total Demand (kt/year)': market_data.total_demand_kt,
-                    'Growth Rate (%)': market_data.growth_rate_percent,
-                    'Price Range (EUR/ton)': f"{market_data.price_range_eur_ton[0]}-{market_data.price_range_eur_ton[1]}",
-                    'Green Premium (%)': market_data.green_premium_percent,
-                    'Last Updated': market_data.last_updated.strftime('%Y-%m-%d %H:%M:%S'),
-                    'Data Source': market_data.data_source
-                }])
-                market_df.to_excel(writer, sheet_name='Market Data', index=False)
-                
-                # Applications sheet
-                apps_df = pd.DataFrame([
-                    {
-                        'Application': app,
-                        'Demand (%)': data['demand_percent'],
-                        'Buyer Types': ', '.join(data['buyer_types']),
-                        'Proximity Need': data['proximity_need'],
-                        'Transport Preference': data['transport_preference'],
-                        'Quality Requirements': data['quality_requirements'],
-                        'Market Growth (%)': data['market_growth'],
-                        'Key German Buyers': ', '.join(data['key_german_buyers'])
-                    } for app, data in applications.items()
-                ])
-                apps_df.to_excel(writer, sheet_name='Applications', index=False)
+            # Buyers sheet
+            buyers_df = pd.DataFrame([
+                {
+                    'Company': b.company_name,
+                    'Location': b.location,
+                    'Latitude': b.coordinates[0],
+                    'Longitude': b.coordinates[1],
+                    'Methanol Demand (kt/year)': b.methanol_demand_kt,
+                    'Primary Use': b.primary_use,
+                    'Contact': b.contact_info,
+                    'Data Source': b.data_source,
+                    'Reliability Score': b.reliability_score
+                } for b in buyers
+            ]).astype({
+                'Location': 'category',
+                'Primary Use': 'category',
+                'Data Source': 'category'
+            })
+            
+            # Market data sheet
+            market_df = pd.DataFrame([{
+                'Region': market_data.region,
+                'Total Demand (kt/year)': market_data.total_demand_kt,
+                'Growth Rate (%)': market_data.growth_rate_percent,
+                'Price Range (EUR/ton)': f"{market_data.price_range_eur_ton[0]}-{market_data.price_range_eur_ton[1]}",
+                'Green Premium (%)': market_data.green_premium_percent,
+                'Last Updated': market_data.last_updated.strftime('%Y-%m-%d %H:%M:%S'),
+                'Data Source': market_data.data_source
+            }])
+            
+            # Applications sheet
+            # Build column-at-a-time rather than one dict per row
+            app_names = list(applications)
+            app_data = list(applications.values())
+            apps_df = pd.DataFrame({
+                'Application': app_names,
+                'Demand (%)': [d['demand_percent'] for d in app_data],
+                'Buyer Types': [', '.join(d['buyer_types']) for d in app_data],
+                'Proximity Need': [d['proximity_need'] for d in app_data],
+                'Transport Preference': [d['transport_preference'] for d in app_data],
+                'Quality Requirements': [d['quality_requirements'] for d in app_data],
+                'Market Growth (%)': [d['market_growth'] for d in app_data],
+                'Key German Buyers': [', '.join(d['key_german_buyers']) for d in app_data]
+            }).astype({
+                'Buyer Types': 'category',
+                'Transport Preference': 'category'
+            })
+            
+            _write_excel_sheets(filename, {
+                'Methanol Buyers': buyers_df,
+                'Market Data': market_df,
+                'Applications': apps_df
+            })
             
             logger.info(f"Exported methanol buyer data to {filename}")
             return filename
@@ -4,22 +4,114 @@ Coordinates real-time data collection from multiple sources and provides unified
 """
 
 import asyncio
+import bisect
+import collections
 import concurrent.futures
+import copy
 from typing import Dict, List, Optional, Any, Tuple
 import logging
-from datetime import datetime, timedelta
-import json
+from datetime import datetime
+import math
+import os
+import statistics
+import threading
+import time
 import pandas as pd
 import numpy as np
+import requests
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
 
 # Import our API connectors
-from api_connectors.industrial_data_api import IndustrialDataConnector, FacilityData
+from api_connectors.industrial_data_api import IndustrialDataConnector, FacilityData, FacilityTable
 from api_connectors.energy_data_api import EnergyDataConnector, EnergyPriceData, RenewableEnergyData
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Freshness score buckets by data age in hours
+_FRESHNESS_BUCKET_HOURS = np.array([1, 6, 24, 72])
+_FRESHNESS_BUCKET_SCORES = np.array([100, 80, 60, 40, 20])
+_FRESHNESS_HOURS = tuple(_FRESHNESS_BUCKET_HOURS.tolist())
+_FRESHNESS_SCORES = tuple(_FRESHNESS_BUCKET_SCORES.tolist())
+
+# Below this many items, parsing timestamps one by one beats pd.to_datetime
+_FRESHNESS_VECTORIZE_MIN_ITEMS = 5000
+
+# Hour-of-day lookup tables for the 24-hour forecast generators
+_FORECAST_HOURS = np.arange(24)
+_HOURLY_SIN = np.sin(2 * np.pi * _FORECAST_HOURS / 24)
+_HOURLY_COS = np.cos(2 * np.pi * _FORECAST_HOURS / 24)
+_SOLAR_PROFILE = np.where(
+    (_FORECAST_HOURS >= 6) & (_FORECAST_HOURS <= 18),
+    np.maximum(0, np.sin(np.pi * (_FORECAST_HOURS - 6) / 12)),
+    0
+)
+
+# Primary country and approximate center coordinates for each region
+_REGION_COUNTRY = {
+    'Central Europe': 'DE',
+    'Western Europe': 'FR',
+    'Southern Europe': 'IT',
+    'Northern Europe': 'SE',
+    'Eastern Europe': 'PL'
+}
+
+_REGION_CENTERS = {
+    'Central Europe': {'lat': 50.8503, 'lon': 4.3517},  # Brussels
+    'Western Europe': {'lat': 48.8566, 'lon': 2.3522},  # Paris
+    'Southern Europe': {'lat': 41.9028, 'lon': 12.4964}, # Rome
+    'Northern Europe': {'lat': 59.3293, 'lon': 18.0686}, # Stockholm
+    'Eastern Europe': {'lat': 52.2297, 'lon': 21.0122}  # Warsaw
+}
+
+# Facility columns used for the regional and emissions aggregations
+_FACILITY_FRAME_COLUMNS = [
+    'facility_id', 'region', 'country', 'industry_type',
+    'co2_emissions_tpy', 'co2_concentration', 'renewable_energy_share'
+]
+
+# Base CO₂ price (€/ton) by region for the CO₂ market forecast
+_CO2_BASE_PRICES = {
+    'Central Europe': 85.0,
+    'Western Europe': 88.0,
+    'Southern Europe': 84.0,
+    'Northern Europe': 82.0,
+    'Eastern Europe': 86.0
+}
+
+def _iter_forecast_rows(market_forecasts: Dict[str, Any]):
+    """Yield one flat record per hourly forecast in a market forecasts payload"""
+    for forecast_type, regions in market_forecasts.items():
+        if not isinstance(regions, dict):
+            continue
+        for region, forecast in regions.items():
+            if not (isinstance(forecast, dict) and 'hourly_forecasts' in forecast):
+                continue
+            for hourly in forecast['hourly_forecasts']:
+                row = {'forecast_type': forecast_type, 'region': region, 'hour': hourly.get('hour', 0)}
+                row.update(hourly)
+                yield row
+
+def _compact_export_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink an export table in place: downcast integers, store repetitive strings as categories"""
+    for column in df.select_dtypes('integer').columns:
+        df[column] = pd.to_numeric(df[column], downcast='integer')
+    for column in df.select_dtypes(include=['object', 'string']).columns:
+        values = df[column]
+        if pd.api.types.infer_dtype(values, skipna=True) == 'string' and values.nunique() < len(df) // 2:
+            df[column] = values.astype('category')
+    return df
+
+def _gather(futures: List[concurrent.futures.Future]) -> List[Any]:
+    """Wait for all futures, then return their results in submission order (re-raising the first error)"""
+    concurrent.futures.wait(futures)
+    return [future.result() for future in futures]
+
 class APIOrchestrator:
     """Main orchestrator for real-time API data collection"""
     
@@ -30,28 +122,148 @@ class APIOrchestrator:
         self.industrial_connector = IndustrialDataConnector(api_keys)
         self.energy_connector = EnergyDataConnector(api_keys)
         
-        # Data cache for performance
-        self.data_cache = {}
+        # Share one connection pool between the connectors' sessions so keep-alive
+        # connections (and their TLS handshakes) are reused across both
+        self._http_adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        for connector in (self.industrial_connector, self.energy_connector):
+            connector.session.mount('https://', self._http_adapter)
+            connector.session.mount('http://', self._http_adapter)
+        
+        # Data cache for performance (LRU of (monotonic time, result) keyed by request)
+        self.data_cache = collections.OrderedDict()
         self.cache_ttl = 300  # 5 minutes cache TTL
+        self.max_cache_entries = 32
+        self._cache_lock = threading.Lock()
+        self._cache_key_locks = {}
         
-        # Rate limiting and throttling
-        self.request_counts = {}
+        # Rate limiting and throttling (sliding one-minute window of request start times)
         self.max_requests_per_minute = 60
+        self._request_times = collections.deque()
+        self._rate_limit_lock = threading.Lock()
+        
+        # Random generator for simulated forecast noise
+        self._rng = np.random.default_rng()
+        
+        # Thread pool for running blocking connector calls concurrently, plus a separate one
+        # for the collectors that wait on those calls (so a collector never waits on its own pool)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix='api-orchestrator'
+        )
+        self._collector_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=3, thread_name_prefix='api-collector'
+        )
         
         logger.info("API Orchestrator initialized")
     
+    def close(self) -> None:
+        """Shut down the worker threads and release pooled HTTP connections"""
+        self._collector_executor.shutdown(wait=True)
+        self._executor.shutdown(wait=True)
+        self.industrial_connector.session.close()
+        self.energy_connector.session.close()
+    
+    def __enter__(self) -> 'APIOrchestrator':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def _run_blocking(self, func, *args, **kwargs) -> concurrent.futures.Future:
+        """Run a blocking connector call on the orchestrator's thread pool"""
+        return self._executor.submit(func, *args, **kwargs)
+    
+    def _run_request(self, func, *args, **kwargs) -> concurrent.futures.Future:
+        """Run a rate-limited upstream API call on the orchestrator's thread pool"""
+        return self._run_blocking(self._rate_limited_call, func, *args, **kwargs)
+    
+    def _rate_limited_call(self, func, *args, **kwargs):
+        """Wait for a free slot in the per-minute request window, then call func"""
+        
+        while True:
+            with self._rate_limit_lock:
+                now = time.monotonic()
+                while self._request_times and now - self._request_times[0] >= 60:
+                    self._request_times.popleft()
+                
+                if len(self._request_times) < self.max_requests_per_minute:
+                    self._request_times.append(now)
+                    break
+                
+                wait_time = 60 - (now - self._request_times[0])
+            
+            logger.debug(f"Request rate limit reached, waiting {wait_time:.2f}s")
+            time.sleep(wait_time)
+        
+        return func(*args, **kwargs)
+    
     def collect_real_time_data(self, 
                               target_regions: List[str] = None,
                               facility_ids: List[str] = None,
                               include_forecasts: bool = True) -> Dict[str, Any]:
         """Collect real-time data from all available sources"""
         
-        logger.info("Starting real-time data collection...")
-        
         # Set default regions if none specified
         if not target_regions:
             target_regions = ['Central Europe', 'Western Europe', 'Southern Europe']
         
+        cache_key = (tuple(sorted(target_regions)), tuple(sorted(facility_ids or ())), include_forecasts)
+        cached = self._get_cached_collection(cache_key)
+        if cached is not None:
+            logger.info("Returning cached real-time data")
+            return cached
+        
+        # Single-flight: concurrent callers with the same request wait for one collection
+        with self._cache_lock:
+            key_lock = self._cache_key_locks.setdefault(cache_key, threading.Lock())
+        
+        with key_lock:
+            cached = self._get_cached_collection(cache_key)
+            if cached is not None:
+                logger.info("Returning cached real-time data")
+                return cached
+            
+            try:
+                real_time_data = self._collect_real_time_data(target_regions, facility_ids, include_forecasts)
+                
+                # Only cache clean collections so failures are retried on the next call; the
+                # cache keeps its own copy so callers may mutate the result they get back
+                if not real_time_data['collection_errors']:
+                    snapshot = copy.deepcopy(real_time_data)
+                    with self._cache_lock:
+                        self.data_cache[cache_key] = (time.monotonic(), snapshot)
+                        self.data_cache.move_to_end(cache_key)
+                        while len(self.data_cache) > self.max_cache_entries:
+                            evicted_key, _ = self.data_cache.popitem(last=False)
+                            self._cache_key_locks.pop(evicted_key, None)
+            finally:
+                # Keys without a cached entry would otherwise keep their lock forever
+                with self._cache_lock:
+                    if cache_key not in self.data_cache:
+                        self._cache_key_locks.pop(cache_key, None)
+            
+            return real_time_data
+    
+    def _get_cached_collection(self, cache_key: Tuple) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached collection result if it is still within the TTL"""
+        
+        with self._cache_lock:
+            hit = self.data_cache.get(cache_key)
+            if hit is None:
+                return None
+            if time.monotonic() - hit[0] >= self.cache_ttl:
+                del self.data_cache[cache_key]
+                return None
+            self.data_cache.move_to_end(cache_key)
+        return copy.deepcopy(hit[1])
+    
+    def _collect_real_time_data(self, 
+                               target_regions: List[str],
+                               facility_ids: List[str],
+                               include_forecasts: bool) -> Dict[str, Any]:
+        """Run a full, uncached collection from all available sources"""
+        
+        logger.info("Starting real-time data collection...")
+        
         # Initialize results container
         real_time_data = {
             'timestamp': datetime.now().isoformat(),
@@ -64,20 +276,13 @@ class APIOrchestrator:
         }
         
         try:
-            # Collect industrial facility data
-            logger.info("Collecting industrial facility data...")
-            industrial_data = self._collect_industrial_data(target_regions, facility_ids)
+            # Collect industrial, energy and (optionally) forecast data concurrently
+            industrial_data, energy_data, forecasts = self._run_collectors(
+                target_regions, facility_ids, include_forecasts
+            )
             real_time_data['industrial_data'] = industrial_data
-            
-            # Collect energy market data
-            logger.info("Collecting energy market data...")
-            energy_data = self._collect_energy_data(target_regions)
             real_time_data['energy_data'] = energy_data
-            
-            # Generate market forecasts if requested
             if include_forecasts:
-                logger.info("Generating market forecasts...")
-                forecasts = self._generate_market_forecasts(target_regions)
                 real_time_data['market_forecasts'] = forecasts
             
             # Assess data quality
@@ -102,6 +307,29 @@ class APIOrchestrator:
             real_time_data['collection_errors'].append(error_msg)
             return real_time_data
     
+    def _run_collectors(self, 
+                             target_regions: List[str],
+                             facility_ids: List[str],
+                             include_forecasts: bool) -> Tuple:
+        """Run the industrial, energy and forecast collectors concurrently"""
+        
+        logger.info("Collecting industrial facility data...")
+        logger.info("Collecting energy market data...")
+        collectors = [
+            self._collector_executor.submit(self._collect_industrial_data, target_regions, facility_ids),
+            self._collector_executor.submit(self._collect_energy_data, target_regions)
+        ]
+        
+        # Generate market forecasts if requested
+        if include_forecasts:
+            logger.info("Generating market forecasts...")
+            collectors.append(self._collector_executor.submit(self._generate_market_forecasts, target_regions))
+        
+        results = _gather(collectors)
+        if not include_forecasts:
+            results.append({})
+        return tuple(results)
+    
     def _collect_industrial_data(self, 
                                 regions: List[str], 
                                 facility_ids: List[str] = None) -> Dict[str, Any]:
@@ -115,80 +343,90 @@ class APIOrchestrator:
         }
         
         try:
-            # Get European industrial data
-            eu_facilities = self.industrial_connector.get_european_industrial_data()
-            
-            # Get EPA facility data for comparison
-            us_facilities = self.industrial_connector.get_epa_facility_data(limit=50)
+            # Get European industrial data and EPA facility data for comparison
+            eu_facilities, us_facilities = _gather([
+                self._run_request(self.industrial_connector.get_european_industrial_data),
+                self._run_request(self.industrial_connector.get_epa_facility_data, limit=50)
+            ])
             
-            # Combine and filter facilities
-            all_facilities = eu_facilities + us_facilities
+            # Combine facilities into a struct-of-arrays table so filters and aggregates run on columns
+            facility_table = FacilityTable.from_facilities(eu_facilities + us_facilities)
             
-            # Filter by regions if specified
+            # Filter by regions and specific facility IDs if specified
+            keep = np.ones(len(facility_table), dtype=bool)
             if regions:
-                all_facilities = [f for f in all_facilities if f.region in regions]
-            
-            # Filter by specific facility IDs if provided
+                keep &= np.isin(facility_table['region'], regions)
             if facility_ids:
-                all_facilities = [f for f in all_facilities if f.facility_id in facility_ids]
+                keep &= np.isin(facility_table['facility_id'], facility_ids)
+            if not keep.all():
+                facility_table = facility_table[keep]
+            facilities_df = facility_table.to_frame(_FACILITY_FRAME_COLUMNS)
             
             # Get real-time CO₂ data for facilities
-            facility_ids_list = [f.facility_id for f in all_facilities]
+            facility_ids_list = facility_table['facility_id'].tolist()
             real_time_co2 = self.industrial_connector.get_real_time_co2_data(
                 facility_ids=facility_ids_list,
                 regions=regions
             )
             
-            # Process and enrich facility data
-            for facility in all_facilities:
+            # Process and enrich facility data, reading each field from its column
+            real_time_facilities = real_time_co2.get('facilities', {})
+            columns = [facility_table.column_values(name) for name in FacilityTable.FIELDS]
+            for (facility_id, name, country, region, latitude, longitude, industry_type,
+                 co2_emissions_tpy, co2_concentration, co2_impurities, power_consumption_mwh,
+                 renewable_energy_share, last_updated, data_source) in zip(*columns):
                 facility_dict = {
-                    'facility_id': facility.facility_id,
-                    'name': facility.name,
-                    'country': facility.country,
-                    'region': facility.region,
-                    'coordinates': {'lat': facility.latitude, 'lon': facility.longitude},
-                    'industry_type': facility.industry_type,
-                    'co2_emissions_tpy': facility.co2_emissions_tpy,
-                    'co2_concentration': facility.co2_concentration,
-                    'co2_impurities': facility.co2_impurities,
-                    'power_consumption_mwh': facility.power_consumption_mwh,
-                    'renewable_energy_share': facility.renewable_energy_share,
-                    'last_updated': facility.last_updated.isoformat(),
-                    'data_source': facility.data_source
+                    'facility_id': facility_id,
+                    'name': name,
+                    'country': country,
+                    'region': region,
+                    'coordinates': {'lat': latitude, 'lon': longitude},
+                    'industry_type': industry_type,
+                    'co2_emissions_tpy': co2_emissions_tpy,
+                    'co2_concentration': co2_concentration,
+                    'co2_impurities': co2_impurities,
+                    'power_consumption_mwh': power_consumption_mwh,
+                    'renewable_energy_share': renewable_energy_share,
+                    'last_updated': last_updated.isoformat(),
+                    'data_source': data_source
                 }
                 
                 # Add real-time CO₂ data if available
-                if facility.facility_id in real_time_co2.get('facilities', {}):
-                    real_time_info = real_time_co2['facilities'][facility.facility_id]
+                real_time_info = real_time_facilities.get(facility_id)
+                if real_time_info is not None:
                     facility_dict['real_time_co2_tph'] = real_time_info.get('current_co2_emissions_tph', 0)
                     facility_dict['real_time_power_mw'] = real_time_info.get('power_consumption_mw', 0)
                     facility_dict['data_quality'] = real_time_info.get('data_quality', 'Medium')
                 
                 industrial_data['facilities'].append(facility_dict)
             
-            # Generate regional summaries
-            for region in regions:
-                region_facilities = [f for f in all_facilities if f.region == region]
-                if region_facilities:
-                    industrial_data['regional_summaries'][region] = {
-                        'total_facilities': len(region_facilities),
-                        'total_co2_emissions_tpy': sum(f.co2_emissions_tpy for f in region_facilities),
-                        'average_co2_concentration': np.mean([f.co2_concentration for f in region_facilities]),
-                        'average_renewable_share': np.mean([f.renewable_energy_share for f in region_facilities]),
-                        'industry_breakdown': self._get_industry_breakdown(region_facilities)
-                    }
+            # Generate regional summaries with a single groupby over the facilities
+            if len(facility_table):
+                region_stats = facilities_df.groupby('region', sort=False).agg(
+                    total_facilities=('region', 'size'),
+                    total_co2_emissions_tpy=('co2_emissions_tpy', 'sum'),
+                    average_co2_concentration=('co2_concentration', 'mean'),
+                    average_renewable_share=('renewable_energy_share', 'mean')
+                ).to_dict('index')
+                industry_counts = facilities_df.groupby(['region', 'industry_type'], sort=False).size()
+                
+                for region in regions:
+                    if region in region_stats:
+                        region_summary = region_stats[region]
+                        region_summary['industry_breakdown'] = industry_counts.loc[region].to_dict()
+                        industrial_data['regional_summaries'][region] = region_summary
             
             # Generate CO₂ emissions summary
-            if all_facilities:
+            if len(facility_table):
                 industrial_data['co2_emissions_summary'] = {
-                    'total_facilities': len(all_facilities),
-                    'total_co2_emissions_tpy': sum(f.co2_emissions_tpy for f in all_facilities),
-                    'average_co2_concentration': np.mean([f.co2_concentration for f in all_facilities]),
-                    'emissions_by_industry': self._get_emissions_by_industry(all_facilities),
-                    'emissions_by_country': self._get_emissions_by_country(all_facilities)
+                    'total_facilities': len(facility_table),
+                    'total_co2_emissions_tpy': facilities_df['co2_emissions_tpy'].sum().item(),
+                    'average_co2_concentration': facilities_df['co2_concentration'].mean(),
+                    'emissions_by_industry': self._get_emissions_by_industry(facilities_df),
+                    'emissions_by_country': self._get_emissions_by_country(facilities_df)
                 }
             
-            logger.info(f"Collected industrial data for {len(all_facilities)} facilities")
+            logger.info(f"Collected industrial data for {len(facility_table)} facilities")
             
         except Exception as e:
             logger.error(f"Error collecting industrial data: {e}")
@@ -208,76 +446,93 @@ class APIOrchestrator:
         }
         
         try:
-            # Get power prices for each region
-            for region in regions:
-                # Map region to country for API calls
-                country = self._get_primary_country_for_region(region)
+            # Map regions to countries for API calls; each distinct country and
+            # region center is requested once and shared by every region using it
+            region_countries = [(region, _REGION_COUNTRY[region]) for region in regions if _REGION_COUNTRY.get(region)]
+            countries = list(dict.fromkeys(country for _, country in region_countries))
+            center_regions = list(dict.fromkeys(region for region, _ in region_countries if region in _REGION_CENTERS))
+            
+            # Fetch prices, renewable generation and real-time prices concurrently
+            results = _gather([
+                *(self._run_request(self.energy_connector.get_eu_power_prices, country=country)
+                  for country in countries),
+                *(self._run_request(self.energy_connector.get_renewable_energy_data,
+                                    _REGION_CENTERS[region]['lat'], _REGION_CENTERS[region]['lon'])
+                  for region in center_regions),
+                self._run_request(self.energy_connector.get_real_time_energy_prices, regions)
+            ])
+            prices_by_country = dict(zip(countries, results[:len(countries)]))
+            renewables_by_region = dict(zip(center_regions, results[len(countries):-1]))
+            real_time_prices = results[-1]
+            
+            region_results = [
+                (region, country, prices_by_country[country], renewables_by_region.get(region))
+                for region, country in region_countries
+            ]
+            
+            prices_by_region = collections.defaultdict(list)
+            for region, country, power_prices, renewable_data in region_results:
+                if renewable_data:
+                    energy_data['renewable_generation'].append({
+                        'region': region,
+                        'country': country,
+                        'solar_generation_mw': renewable_data.solar_generation_mw,
+                        'wind_generation_mw': renewable_data.wind_generation_mw,
+                        'hydro_generation_mw': renewable_data.hydro_generation_mw,
+                        'biomass_generation_mw': renewable_data.biomass_generation_mw,
+                        'total_renewable_mw': renewable_data.total_renewable_mw,
+                        'total_generation_mw': renewable_data.total_generation_mw,
+                        'renewable_percentage': renewable_data.renewable_percentage,
+                        'timestamp': renewable_data.timestamp.isoformat(),
+                        'data_source': renewable_data.data_source
+                    })
                 
-                if country:
-                    # Get EU power prices
-                    power_prices = self.energy_connector.get_eu_power_prices(country=country)
-                    
-                    # Get renewable energy data for region center
-                    region_center = self._get_region_center(region)
-                    if region_center:
-                        renewable_data = self.energy_connector.get_renewable_energy_data(
-                            region_center['lat'], region_center['lon']
-                        )
-                        
-                        energy_data['renewable_generation'].append({
-                            'region': region,
-                            'country': country,
-                            'solar_generation_mw': renewable_data.solar_generation_mw,
-                            'wind_generation_mw': renewable_data.wind_generation_mw,
-                            'hydro_generation_mw': renewable_data.hydro_generation_mw,
-                            'biomass_generation_mw': renewable_data.biomass_generation_mw,
-                            'total_renewable_mw': renewable_data.total_renewable_mw,
-                            'total_generation_mw': renewable_data.total_generation_mw,
-                            'renewable_percentage': renewable_data.renewable_percentage,
-                            'timestamp': renewable_data.timestamp.isoformat(),
-                            'data_source': renewable_data.data_source
-                        })
-                    
-                    # Add power prices to collection
-                    for price in power_prices:
-                        energy_data['power_prices'].append({
-                            'region': region,
-                            'country': country,
-                            'timestamp': price.timestamp.isoformat(),
-                            'power_price_eur_mwh': price.power_price_eur_mwh,
-                            'power_price_usd_mwh': price.power_price_usd_mwh,
-                            'renewable_energy_share': price.renewable_energy_share,
-                            'grid_capacity_mw': price.grid_capacity_mw,
-                            'demand_mw': price.demand_mw,
-                            'supply_mw': price.supply_mw,
-                            'carbon_intensity_gco2_kwh': price.carbon_intensity_gco2_kwh,
-                            'data_source': price.data_source
-                        })
+                # Add power prices to collection, grouped by region for the summaries below
+                region_prices = prices_by_region[region]
+                for price in power_prices:
+                    price_record = {
+                        'region': region,
+                        'country': country,
+                        'timestamp': price.timestamp.isoformat(),
+                        'power_price_eur_mwh': price.power_price_eur_mwh,
+                        'power_price_usd_mwh': price.power_price_usd_mwh,
+                        'renewable_energy_share': price.renewable_energy_share,
+                        'grid_capacity_mw': price.grid_capacity_mw,
+                        'demand_mw': price.demand_mw,
+                        'supply_mw': price.supply_mw,
+                        'carbon_intensity_gco2_kwh': price.carbon_intensity_gco2_kwh,
+                        'data_source': price.data_source
+                    }
+                    energy_data['power_prices'].append(price_record)
+                    region_prices.append(price_record)
             
-            # Get real-time energy prices
-            real_time_prices = self.energy_connector.get_real_time_energy_prices(regions)
             energy_data['real_time_prices'] = real_time_prices
             
             # Generate regional summaries
             for region in regions:
-                region_prices = [p for p in energy_data['power_prices'] if p['region'] == region]
+                region_prices = prices_by_region.get(region)
                 if region_prices:
+                    prices = [p['power_price_eur_mwh'] for p in region_prices]
+                    average_price = statistics.fmean(prices)
                     energy_data['regional_summaries'][region] = {
-                        'current_price_eur_mwh': region_prices[-1]['power_price_eur_mwh'],
-                        'average_price_eur_mwh': np.mean([p['power_price_eur_mwh'] for p in region_prices]),
-                        'price_volatility': np.std([p['power_price_eur_mwh'] for p in region_prices]),
-                        'average_renewable_share': np.mean([p['renewable_energy_share'] for p in region_prices]),
-                        'average_demand_mw': np.mean([p['demand_mw'] for p in region_prices]),
+                        'current_price_eur_mwh': prices[-1],
+                        'average_price_eur_mwh': average_price,
+                        'price_volatility': math.sqrt(statistics.fmean((x - average_price) ** 2 for x in prices)),
+                        'average_renewable_share': statistics.fmean(p['renewable_energy_share'] for p in region_prices),
+                        'average_demand_mw': statistics.fmean(p['demand_mw'] for p in region_prices),
                         'data_points': len(region_prices)
                     }
             
             # Generate market indicators
             if energy_data['power_prices']:
-                all_prices = [p['power_price_eur_mwh'] for p in energy_data['power_prices']]
+                all_prices = np.fromiter(
+                    (p['power_price_eur_mwh'] for p in energy_data['power_prices']),
+                    dtype=np.float64, count=len(energy_data['power_prices'])
+                )
                 energy_data['market_indicators'] = {
-                    'eu_average_price_eur_mwh': np.mean(all_prices),
-                    'eu_price_range_eur_mwh': {'min': min(all_prices), 'max': max(all_prices)},
-                    'eu_price_volatility': np.std(all_prices),
+                    'eu_average_price_eur_mwh': all_prices.mean().item(),
+                    'eu_price_range_eur_mwh': {'min': all_prices.min().item(), 'max': all_prices.max().item()},
+                    'eu_price_volatility': all_prices.std().item(),
                     'total_data_points': len(energy_data['power_prices']),
                     'regions_covered': len(energy_data['regional_summaries'])
                 }
@@ -302,8 +557,11 @@ class APIOrchestrator:
         
         try:
             # Generate energy market forecasts
-            for region in regions:
-                energy_forecast = self.energy_connector.get_energy_market_forecast(region, 24)
+            energy_forecasts = _gather([
+                self._run_blocking(self.energy_connector.get_energy_market_forecast, region, 24)
+                for region in regions
+            ])
+            for region, energy_forecast in zip(regions, energy_forecasts):
                 if energy_forecast:
                     forecasts['energy_market'][region] = energy_forecast
             
@@ -333,45 +591,42 @@ class APIOrchestrator:
         try:
             # Simulate CO₂ market forecasting
             current_hour = datetime.now().hour
+            forecast_hours = (current_hour + _FORECAST_HOURS) % 24
+            hour_sin = _HOURLY_SIN[forecast_hours]
+            hour_cos = _HOURLY_COS[forecast_hours]
+            
+            # Base CO₂ price varies by region
+            base_price = _CO2_BASE_PRICES.get(region, 85.0)
+            
+            # Simulate price variations for all 24 hours at once
+            market_noise, demand_noise, supply_noise = self._rng.standard_normal((3, 24))
+            time_factor = 1.0 + 0.1 * hour_sin
+            market_factor = 1.0 + 0.05 * market_noise
+            
+            forecast_prices = np.clip(base_price * time_factor * market_factor, 60, 120)  # Clamp between €60-120/ton
+            demand_factors = 0.8 + 0.4 * hour_sin + 0.1 * demand_noise
+            supply_factors = 1.0 + 0.2 * hour_cos + 0.1 * supply_noise
             
             forecast_data = {
                 'region': region,
                 'forecast_hours': 24,
                 'timestamp': datetime.now().isoformat(),
-                'hourly_forecasts': []
+                'hourly_forecasts': [
+                    {
+                        'hour': hour,
+                        'co2_price_eur_ton': price,
+                        'demand_factor': demand,
+                        'supply_factor': supply
+                    }
+                    for hour, price, demand, supply in zip(
+                        forecast_hours.tolist(),
+                        np.round(forecast_prices, 2).tolist(),
+                        demand_factors.tolist(),
+                        supply_factors.tolist()
+                    )
+                ]
             }
             
-            # Generate hourly CO₂ price forecasts
-            for hour in range(24):
-                forecast_hour = (current_hour + hour) % 24
-                
-                # Base CO₂ price varies by region
-                base_prices = {
-                    'Central Europe': 85.0,
-                    'Western Europe': 88.0,
-                    'Southern Europe': 84.0,
-                    'Northern Europe': 82.0,
-                    'Eastern Europe': 86.0
-                }
-                
-                base_price = base_prices.get(region, 85.0)
-                
-                # Simulate price variations
-                time_factor = 1.0 + 0.1 * np.sin(2 * np.pi * forecast_hour / 24)
-                market_factor = 1.0 + np.random.normal(0, 0.05)
-                
-                forecast_price = base_price * time_factor * market_factor
-                forecast_price = max(60, min(120, forecast_price))  # Clamp between €60-120/ton
-                
-                hourly_forecast = {
-                    'hour': forecast_hour,
-                    'co2_price_eur_ton': round(forecast_price, 2),
-                    'demand_factor': 0.8 + 0.4 * np.sin(2 * np.pi * forecast_hour / 24) + np.random.normal(0, 0.1),
-                    'supply_factor': 1.0 + 0.2 * np.cos(2 * np.pi * forecast_hour / 24) + np.random.normal(0, 0.1)
-                }
-                
-                forecast_data['hourly_forecasts'].append(hourly_forecast)
-            
             return forecast_data
             
         except Exception as e:
@@ -384,45 +639,50 @@ class APIOrchestrator:
         try:
             # Simulate renewable energy forecasting
             current_hour = datetime.now().hour
+            forecast_hours = (current_hour + _FORECAST_HOURS) % 24
+            solar_noise, wind_noise, hydro_noise, biomass_noise = self._rng.standard_normal((4, 24))
+            
+            # Solar generation (peak at noon)
+            solar_generation = 1000 * _SOLAR_PROFILE[forecast_hours] + 50 * solar_noise
+            
+            # Wind generation (more variable)
+            wind_base = 800
+            wind_factor = 0.5 + 0.5 * _HOURLY_SIN[forecast_hours] + 0.2 * wind_noise
+            wind_generation = wind_base * wind_factor
+            
+            # Hydro and biomass (stable)
+            hydro_generation = 600 + 100 * hydro_noise
+            biomass_generation = 400 + 50 * biomass_noise
+            
+            total_renewable = np.maximum(0, solar_generation + wind_generation + hydro_generation + biomass_generation)
+            renewable_percentage = np.round((total_renewable / (total_renewable + 2000)) * 100, 1)
             
             forecast_data = {
                 'region': region,
                 'forecast_hours': 24,
                 'timestamp': datetime.now().isoformat(),
-                'hourly_forecasts': []
+                'hourly_forecasts': [
+                    {
+                        'hour': hour,
+                        'solar_mw': solar,
+                        'wind_mw': wind,
+                        'hydro_mw': hydro,
+                        'biomass_mw': biomass,
+                        'total_renewable_mw': total,
+                        'renewable_percentage': percentage
+                    }
+                    for hour, solar, wind, hydro, biomass, total, percentage in zip(
+                        forecast_hours.tolist(),
+                        np.maximum(0, solar_generation).tolist(),
+                        np.maximum(0, wind_generation).tolist(),
+                        np.maximum(0, hydro_generation).tolist(),
+                        np.maximum(0, biomass_generation).tolist(),
+                        total_renewable.tolist(),
+                        renewable_percentage.tolist()
+                    )
+                ]
             }
             
-            # Generate hourly renewable forecasts
-            for hour in range(24):
-                forecast_hour = (current_hour + hour) % 24
-                
-                # Solar generation (peak at noon)
-                solar_factor = max(0, np.sin(np.pi * (forecast_hour - 6) / 12)) if 6 <= forecast_hour <= 18 else 0
-                solar_generation = 1000 * solar_factor + np.random.normal(0, 50)
-                
-                # Wind generation (more variable)
-                wind_base = 800
-                wind_factor = 0.5 + 0.5 * np.sin(2 * np.pi * forecast_hour / 24) + np.random.normal(0, 0.2)
-                wind_generation = wind_base * wind_factor
-                
-                # Hydro and biomass (stable)
-                hydro_generation = 600 + np.random.normal(0, 100)
-                biomass_generation = 400 + np.random.normal(0, 50)
-                
-                total_renewable = max(0, solar_generation + wind_generation + hydro_generation + biomass_generation)
-                
-                hourly_forecast = {
-                    'hour': forecast_hour,
-                    'solar_mw': max(0, solar_generation),
-                    'wind_mw': max(0, wind_generation),
-                    'hydro_mw': max(0, hydro_generation),
-                    'biomass_mw': max(0, biomass_generation),
-                    'total_renewable_mw': total_renewable,
-                    'renewable_percentage': round((total_renewable / (total_renewable + 2000)) * 100, 1)
-                }
-                
-                forecast_data['hourly_forecasts'].append(hourly_forecast)
-            
             return forecast_data
             
         except Exception as e:
@@ -441,6 +701,9 @@ class APIOrchestrator:
             'recommendations': []
         }
         
+        # Flat list of every category score, collected as they are computed
+        scores = []
+        
         try:
             # Assess industrial data quality
             industrial_data = collected_data.get('industrial_data', {})
@@ -450,14 +713,17 @@ class APIOrchestrator:
                     # Completeness
                     completeness_score = self._calculate_completeness_score(facilities)
                     data_quality['completeness']['industrial'] = completeness_score
+                    scores.append(completeness_score)
                     
                     # Freshness
                     freshness_score = self._calculate_freshness_score(facilities)
                     data_quality['freshness']['industrial'] = freshness_score
+                    scores.append(freshness_score)
                     
                     # Consistency
                     consistency_score = self._calculate_consistency_score(facilities)
                     data_quality['consistency']['industrial'] = consistency_score
+                    scores.append(consistency_score)
             
             # Assess energy data quality
             energy_data = collected_data.get('energy_data', {})
@@ -467,21 +733,16 @@ class APIOrchestrator:
                     # Completeness
                     completeness_score = self._calculate_completeness_score(power_prices)
                     data_quality['completeness']['energy'] = completeness_score
+                    scores.append(completeness_score)
                     
                     # Freshness
                     freshness_score = self._calculate_freshness_score(power_prices)
                     data_quality['freshness']['energy'] = freshness_score
+                    scores.append(freshness_score)
             
             # Calculate overall quality score
-            scores = []
-            for category in ['completeness', 'freshness', 'consistency']:
-                if category in data_quality and isinstance(data_quality[category], dict):
-                    category_scores = data_quality[category].values()
-                    if category_scores:
-                        scores.extend(category_scores)
-            
             if scores:
-                data_quality['overall_score'] = round(np.mean(scores), 1)
+                data_quality['overall_score'] = round(statistics.fmean(scores), 1)
             else:
                 data_quality['overall_score'] = 0
             
@@ -502,21 +763,21 @@ class APIOrchestrator:
         
         required_fields = ['timestamp', 'data_source']
         optional_fields = ['coordinates', 'last_updated']
+        n_items = len(data_items)
         
-        completeness_scores = []
+        # Count populated fields per item in one pass, then weight required fields more heavily
+        required_present = np.fromiter(
+            (sum(bool(item.get(field)) for field in required_fields) for item in data_items),
+            dtype=np.int8, count=n_items
+        )
+        optional_present = np.fromiter(
+            (sum(bool(item.get(field)) for field in optional_fields) for item in data_items),
+            dtype=np.int8, count=n_items
+        )
         
-        for item in data_items:
-            # Check required fields
-            required_score = sum(1 for field in required_fields if field in item and item[field]) / len(required_fields)
-            
-            # Check optional fields
-            optional_score = sum(1 for field in optional_fields if field in item and item[field]) / len(optional_fields)
-            
-            # Weighted score (required fields more important)
-            item_score = (required_score * 0.8) + (optional_score * 0.2)
-            completeness_scores.append(item_score)
+        completeness_scores = (required_present / len(required_fields)) * 0.8 + (optional_present / len(optional_fields)) * 0.2
         
-        return round(np.mean(completeness_scores) * 100, 1)
+        return round(completeness_scores.mean() * 100, 1)
     
     def _calculate_freshness_score(self, data_items: List[Dict]) -> float:
         """Calculate freshness score for data items"""
@@ -524,40 +785,46 @@ class APIOrchestrator:
         if not data_items:
             return 0.0
         
-        current_time = datetime.now()
-        freshness_scores = []
-        
-        for item in data_items:
-            timestamp_str = item.get('timestamp') or item.get('last_updated')
-            if timestamp_str:
-                try:
-                    if isinstance(timestamp_str, str):
-                        timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    else:
-                        timestamp = timestamp_str
-                    
-                    time_diff = current_time - timestamp
-                    hours_old = time_diff.total_seconds() / 3600
-                    
-                    # Score based on how recent the data is
-                    if hours_old <= 1:
-                        score = 100
-                    elif hours_old <= 6:
-                        score = 80
-                    elif hours_old <= 24:
-                        score = 60
-                    elif hours_old <= 72:
-                        score = 40
-                    else:
-                        score = 20
-                    
-                    freshness_scores.append(score)
-                except Exception:
-                    freshness_scores.append(0)
+        if len(data_items) >= _FRESHNESS_VECTORIZE_MIN_ITEMS:
+            # Parse all timestamps in one pass; unparseable or missing values become NaT
+            stamps = pd.Series([
+                stamp if isinstance(stamp, (str, datetime)) else None
+                for stamp in (item.get('timestamp') or item.get('last_updated') for item in data_items)
+            ], dtype=object)
+            try:
+                timestamps = pd.to_datetime(stamps, errors='coerce', format='ISO8601')
+            except ValueError:
+                # Mixed naive/aware values or UTC offsets; score item by item below
+                pass
             else:
-                freshness_scores.append(0)
+                # Naive values are local time, like pd.Timestamp.now() without a timezone
+                current_time = pd.Timestamp.now(tz=timestamps.dt.tz)
+                hours_old = ((current_time - timestamps).dt.total_seconds() / 3600).to_numpy()
+                
+                # Score based on how recent the data is: <=1h, <=6h, <=24h, <=72h, older
+                buckets = np.searchsorted(_FRESHNESS_BUCKET_HOURS, hours_old, side='left')
+                freshness_scores = np.where(np.isnan(hours_old), 0, _FRESHNESS_BUCKET_SCORES[buckets])
+                return round(freshness_scores.mean(), 1)
+        
+        # Naive timestamps are local time; aware ones are compared against the same instant
+        local_time = datetime.now()
+        aware_time = local_time.astimezone()
+        total_score = 0
         
-        return round(np.mean(freshness_scores), 1) if freshness_scores else 0.0
+        for item in data_items:
+            timestamp = item.get('timestamp') or item.get('last_updated')
+            try:
+                if isinstance(timestamp, str):
+                    timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                elif not isinstance(timestamp, datetime):
+                    continue
+                current_time = local_time if timestamp.tzinfo is None else aware_time
+                hours_old = (current_time - timestamp).total_seconds() / 3600
+            except (TypeError, ValueError, OverflowError):
+                continue
+            total_score += _FRESHNESS_SCORES[bisect.bisect_left(_FRESHNESS_HOURS, hours_old)]
+        
+        return round(np.float64(total_score / len(data_items)), 1)
     
     def _calculate_consistency_score(self, data_items: List[Dict]) -> float:
         """Calculate consistency score for data items"""
@@ -565,9 +832,8 @@ class APIOrchestrator:
         if not data_items:
             return 0.0
         
-        # Check for consistent data types and ranges
-        consistency_scores = []
-        
+        # Check for consistent data types and ranges in a single pass over the items
+        total_score = 0
         for item in data_items:
             score = 100
             
@@ -587,9 +853,9 @@ class APIOrchestrator:
                 if not isinstance(share, (int, float)) or share < 0 or share > 100:
                     score -= 30
             
-            consistency_scores.append(max(0, score))
+            total_score += max(0, score)
         
-        return round(np.mean(consistency_scores), 1) if consistency_scores else 0.0
+        return round(np.float64(total_score / len(data_items)), 1)
     
     def _generate_quality_recommendations(self, data_quality: Dict[str, Any]) -> List[str]:
         """Generate recommendations for improving data quality"""
@@ -624,65 +890,64 @@ class APIOrchestrator:
         
         return recommendations[:10]  # Limit to top 10 recommendations
     
-    def _get_primary_country_for_region(self, region: str) -> Optional[str]:
-        """Get primary country for a region"""
-        
-        region_country_map = {
-            'Central Europe': 'DE',
-            'Western Europe': 'FR',
-            'Southern Europe': 'IT',
-            'Northern Europe': 'SE',
-            'Eastern Europe': 'PL'
-        }
+    def _get_emissions_by_industry(self, facilities_df: pd.DataFrame) -> Dict[str, float]:
+        """Get CO₂ emissions breakdown by industry"""
         
-        return region_country_map.get(region)
+        return facilities_df.groupby('industry_type', sort=False)['co2_emissions_tpy'].sum().to_dict()
     
-    def _get_region_center(self, region: str) -> Optional[Dict[str, float]]:
-        """Get approximate center coordinates for a region"""
-        
-        region_centers = {
-            'Central Europe': {'lat': 50.8503, 'lon': 4.3517},  # Brussels
-            'Western Europe': {'lat': 48.8566, 'lon': 2.3522},  # Paris
-            'Southern Europe': {'lat': 41.9028, 'lon': 12.4964}, # Rome
-            'Northern Europe': {'lat': 59.3293, 'lon': 18.0686}, # Stockholm
-            'Eastern Europe': {'lat': 52.2297, 'lon': 21.0122}  # Warsaw
-        }
+    def _get_emissions_by_country(self, facilities_df: pd.DataFrame) -> Dict[str, float]:
+        """Get CO₂ emissions breakdown by country"""
         
-        return region_centers.get(region)
+        return facilities_df.groupby('country', sort=False)['co2_emissions_tpy'].sum().to_dict()
     
-    def _get_industry_breakdown(self, facilities: List[FacilityData]) -> Dict[str, int]:
-        """Get industry breakdown for facilities"""
+    def _build_export_tables(self, real_time_data: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
+        """Assemble the exportable tables of a real-time data collection, keyed by sheet name"""
         
-        industry_counts = {}
-        for facility in facilities:
-            industry = facility.industry_type
-            industry_counts[industry] = industry_counts.get(industry, 0) + 1
+        tables = {}
         
-        return industry_counts
-    
-    def _get_emissions_by_industry(self, facilities: List[FacilityData]) -> Dict[str, float]:
-        """Get CO₂ emissions breakdown by industry"""
+        # Export industrial data
+        if real_time_data.get('industrial_data', {}).get('facilities'):
+            tables['Industrial_Data'] = pd.DataFrame(real_time_data['industrial_data']['facilities'])
         
-        industry_emissions = {}
-        for facility in facilities:
-            industry = facility.industry_type
-            if industry not in industry_emissions:
-                industry_emissions[industry] = 0
-            industry_emissions[industry] += facility.co2_emissions_tpy
-        
-        return industry_emissions
-    
-    def _get_emissions_by_country(self, facilities: List[FacilityData]) -> Dict[str, float]:
-        """Get CO₂ emissions breakdown by country"""
+        # Export energy data
+        if real_time_data.get('energy_data', {}).get('power_prices'):
+            tables['Energy_Data'] = pd.DataFrame(real_time_data['energy_data']['power_prices'])
         
-        country_emissions = {}
-        for facility in facilities:
-            country = facility.country
-            if country not in country_emissions:
-                country_emissions[country] = 0
-            country_emissions[country] += facility.co2_emissions_tpy
+        # Export renewable data
+        if real_time_data.get('energy_data', {}).get('renewable_generation'):
+            tables['Renewable_Data'] = pd.DataFrame(real_time_data['energy_data']['renewable_generation'])
         
-        return country_emissions
+        # Export market forecasts, one typed column per hourly forecast field
+        if real_time_data.get('market_forecasts'):
+            forecasts_df = pd.DataFrame.from_records(
+                _iter_forecast_rows(real_time_data['market_forecasts'])
+            )
+            if not forecasts_df.empty:
+                tables['Market_Forecasts'] = forecasts_df
+        
+        # Export data quality assessment
+        if real_time_data.get('data_quality'):
+            quality_data = []
+            for category, scores in real_time_data['data_quality'].items():
+                if isinstance(scores, dict):
+                    for data_type, score in scores.items():
+                        quality_data.append({
+                            'category': category,
+                            'data_type': data_type,
+                            'score': score
+                        })
+                elif isinstance(scores, (int, float)):
+                    quality_data.append({
+                        'category': category,
+                        'data_type': 'overall',
+                        'score': scores
+                    })
+            
+            if quality_data:
+                tables['Data_Quality'] = pd.DataFrame(quality_data)
+        
+        # Floats stay float64: float32 would change the decimals written to Excel
+        return {sheet_name: _compact_export_frame(df) for sheet_name, df in tables.items()}
     
     def export_real_time_data(self, 
                              real_time_data: Dict[str, Any], 
@@ -694,62 +959,11 @@ class APIOrchestrator:
             filename = f"realtime_data_export_{timestamp}.xlsx"
         
         try:
-            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                # Export industrial data
-                if real_time_data.get('industrial_data', {}).get('facilities'):
-                    industrial_df = pd.DataFrame(real_time_data['industrial_data']['facilities'])
-                    industrial_df.to_excel(writer, sheet_name='Industrial_Data', index=False)
-                
-                # Export energy data
-                if real_time_data.get('energy_data', {}).get('power_prices'):
-                    energy_df = pd.DataFrame(real_time_data['energy_data']['power_prices'])
-                    energy_df.to_excel(writer, sheet_name='Energy_Data', index=False)
-                
-                # Export renewable data
-                if real_time_data.get('energy_data', {}).get('renewable_generation'):
-                    renewable_df = pd.DataFrame(real_time_data['energy_data']['renewable_generation'])
-                    renewable_df.to_excel(writer, sheet_name='Renewable_Data', index=False)
-                
-                # Export market forecasts
-                if real_time_data.get('market_forecasts'):
-                    forecasts_data = []
-                    for forecast_type, regions in real_time_data['market_forecasts'].items():
-                        if isinstance(regions, dict):
-                            for region, forecast in regions.items():
-                                if isinstance(forecast, dict) and 'hourly_forecasts' in forecast:
-                                    for hourly in forecast['hourly_forecasts']:
-                                        forecasts_data.append({
-                                            'forecast_type': forecast_type,
-                                            'region': region,
-                                            'hour': hourly.get('hour', 0),
-                                            'data': json.dumps(hourly)
-                                        })
-                    
-                    if forecasts_data:
-                        forecasts_df = pd.DataFrame(forecasts_data)
-                        forecasts_df.to_excel(writer, sheet_name='Market_Forecasts', index=False)
-                
-                # Export data quality assessment
-                if real_time_data.get('data_quality'):
-                    quality_data = []
-                    for category, scores in real_time_data['data_quality'].items():
-                        if isinstance(scores, dict):
-                            for data_type, score in scores.items():
-                                quality_data.append({
-                                    'category': category,
-                                    'data_type': data_type,
-                                    'score': score
-                                })
-                        elif isinstance(scores, (int, float)):
-                            quality_data.append({
-                                'category': category,
-                                'data_type': 'overall',
-                                'score': scores
-                            })
-                    
-                    if quality_data:
-                        quality_df = pd.DataFrame(quality_data)
-                        quality_df.to_excel(writer, sheet_name='Data_Quality', index=False)
+            # xlsxwriter is a much faster writer than openpyxl; fall back when it isn't installed
+            engine = 'xlsxwriter' if xlsxwriter is not None else 'openpyxl'
+            with pd.ExcelWriter(filename, engine=engine) as writer:
+                for sheet_name, df in self._build_export_tables(real_time_data).items():
+                    df.to_excel(writer, sheet_name=sheet_name, index=False)
             
             logger.info(f"Real-time data exported to {filename}")
             return filename
@@ -757,28 +971,52 @@ class APIOrchestrator:
         except Exception as e:
             logger.error(f"Error exporting real-time data: {e}")
             raise
+    
+    def export_real_time_data_parquet(self, 
+                                     real_time_data: Dict[str, Any], 
+                                     output_dir: str = None) -> List[str]:
+        """Export real-time data as one zstd-compressed Parquet file per table (requires pyarrow)"""
+        
+        if not output_dir:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_dir = f"realtime_data_export_{timestamp}"
+        
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            
+            filenames = []
+            for sheet_name, df in self._build_export_tables(real_time_data).items():
+                filename = os.path.join(output_dir, f"{sheet_name.lower()}.parquet")
+                df.to_parquet(filename, engine='pyarrow', compression='zstd', index=False)
+                filenames.append(filename)
+            
+            logger.info(f"Real-time data exported to {output_dir}")
+            return filenames
+            
+        except Exception as e:
+            logger.error(f"Error exporting real-time data to Parquet: {e}")
+            raise
 
 # Example usage and testing
 if __name__ == "__main__":
-    # Initialize orchestrator
-    orchestrator = APIOrchestrator()
-    
-    # Collect real-time data
-    print("Collecting real-time data...")
-    real_time_data = orchestrator.collect_real_time_data(
-        target_regions=['Central Europe', 'Western Europe'],
-        include_forecasts=True
-    )
-    
-    print(f"Data collection complete. Overall quality score: {real_time_data.get('data_quality', {}).get('overall_score', 'N/A')}")
-    
-    # Export data
-    filename = orchestrator.export_real_time_data(real_time_data)
-    print(f"Data exported to: {filename}")
-    
-    # Print summary
-    print(f"\nSummary:")
-    print(f"  Industrial facilities: {len(real_time_data.get('industrial_data', {}).get('facilities', []))}")
-    print(f"  Energy data points: {len(real_time_data.get('energy_data', {}).get('power_prices', []))}")
-    print(f"  Regions covered: {len(real_time_data.get('energy_data', {}).get('regional_summaries', {}))}")
-    print(f"  Forecasts generated: {len(real_time_data.get('market_forecasts', {}))}")
+    # Initialize orchestrator (closing its worker threads when done)
+    with APIOrchestrator() as orchestrator:
+        # Collect real-time data
+        print("Collecting real-time data...")
+        real_time_data = orchestrator.collect_real_time_data(
+            target_regions=['Central Europe', 'Western Europe'],
+            include_forecasts=True
+        )
+        
+        print(f"Data collection complete. Overall quality score: {real_time_data.get('data_quality', {}).get('overall_score', 'N/A')}")
+        
+        # Export data
+        filename = orchestrator.export_real_time_data(real_time_data)
+        print(f"Data exported to: {filename}")
+        
+        # Print summary
+        print(f"\nSummary:")
+        print(f"  Industrial facilities: {len(real_time_data.get('industrial_data', {}).get('facilities', []))}")
+        print(f"  Energy data points: {len(real_time_data.get('energy_data', {}).get('power_prices', []))}")
+        print(f"  Regions covered: {len(real_time_data.get('energy_data', {}).get('regional_summaries', {}))}")
+        print(f"  Forecasts generated: {len(real_time_data.get('market_forecasts', {}))}")
@@ -5,16 +5,39 @@ Handles EU ETS, CBAM, Green Deal, and regional incentives analysis
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, NamedTuple, Tuple, Optional
 from dataclasses import dataclass
 import logging
 from datetime import datetime, date
 import json
+import tempfile
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Policy risk factors and their weight per occurrence
+_POLICY_RISK_FACTORS = {
+    'eu_parliament_elections': 5,  # Elections every 5 years
+    'national_elections': 3,       # National elections
+    'regulatory_changes': 8,      # EU regulatory updates
+    'market_volatility': 4        # Carbon market fluctuations
+}
+_POLICY_RISK_WEIGHT_TOTAL = sum(_POLICY_RISK_FACTORS.values())
+
+class ETSSavingsProjection(NamedTuple):
+    """EU ETS savings projection as NumPy arrays for numeric callers"""
+    current_price_eur_ton: float
+    annual_savings_eur: float
+    future_years: np.ndarray
+    future_prices_eur_ton: np.ndarray
+    future_savings_eur: np.ndarray
+
 @dataclass
 class EUPolicyMetrics:
     """EU policy and incentive metrics for a site"""
@@ -54,7 +77,7 @@ class EUPolicyEngine:
     def __init__(self):
         self.eu_countries = [
             'AT', 'BE', 'BG', 'HR', 'CY', 'CZ', 'DE', 'DK', 'EE', 'FI',
-            'FR', 'DE', 'GR', 'HU', 'IE', 'IT', 'LV', 'LT', 'LU', 'MT',
+            'FR', 'GR', 'HU', 'IE', 'IT', 'LV', 'LT', 'LU', 'MT',
             'NL', 'PL', 'PT', 'RO', 'SK', 'SI', 'ES', 'SE'
         ]
         
@@ -109,31 +132,98 @@ class EUPolicyEngine:
                 'policy_stability': 70
             }
         }
+        
+        # Lookup tables derived from the policy data above
+        self._build_policy_tables()
+    
+    def _build_policy_tables(self) -> None:
+        """(Re)build the lookup tables derived from eu_countries, ets_price_trends, cbam_sectors and regional_incentives"""
+        
+        # EU membership set for constant-time checks
+        self._eu_countries_set = frozenset(self.eu_countries)
+        
+        # Sorted year/price arrays of the ETS trend for vectorized lookups
+        self._ets_years = np.array([int(year) for year in self.ets_price_trends], dtype=np.int32)
+        self._ets_prices = np.array(list(self.ets_price_trends.values()), dtype=np.float64)
+        order = np.argsort(self._ets_years)
+        self._ets_years = self._ets_years[order]
+        self._ets_prices = self._ets_prices[order]
+        
+        # Lowercased product -> CBAM sectors index for constant-time scope checks
+        self._product_to_sectors = {}
+        for sector, products in self.cbam_sectors.items():
+            for product in products:
+                sectors = self._product_to_sectors.setdefault(product.lower(), [])
+                if sector not in sectors:
+                    sectors.append(sector)
+        
+        # Per-country incentive columns for batch analysis
+        self._country_stability = pd.Series(
+            {country: incentives['policy_stability'] for country, incentives in self.regional_incentives.items()},
+            dtype=np.float64
+        )
+        self._country_tax = pd.Series(
+            {country: incentives['tax_benefits'] for country, incentives in self.regional_incentives.items()},
+            dtype=np.float64
+        )
+        self._country_grant = pd.Series(
+            {country: 0.30 * 1000000 if incentives['grants'] else 0.0
+             for country, incentives in self.regional_incentives.items()},
+            dtype=np.float64
+        )
+    
+    def clear_policy_cache(self) -> None:
+        """Rebuild the derived lookup tables
+        
+        Call after changing eu_countries, ets_price_trends, cbam_sectors or regional_incentives.
+        """
+        self._build_policy_tables()
+    
+    def project_ets_savings(self, project_co2_reduction: float) -> ETSSavingsProjection:
+        """Project EU ETS savings as arrays; an array of reductions yields one savings row per project"""
+        
+        # Get current ETS price
+        current_year = datetime.now().year
+        idx = np.searchsorted(self._ets_years, current_year)
+        if idx < len(self._ets_years) and self._ets_years[idx] == current_year:
+            ets_price = self._ets_prices[idx].item()
+            future_idx = idx + 1
+        else:
+            ets_price = 85.0
+            future_idx = idx
+        
+        # Project future savings (assuming price increases)
+        future_prices = self._ets_prices[future_idx:]
+        return ETSSavingsProjection(
+            current_price_eur_ton=ets_price,
+            annual_savings_eur=project_co2_reduction * ets_price,
+            future_years=self._ets_years[future_idx:],
+            future_prices_eur_ton=future_prices,
+            future_savings_eur=np.multiply.outer(project_co2_reduction, future_prices)
+        )
     
     def calculate_eu_ets_impact(self, 
                                site_data: Dict,
                                project_co2_reduction: float) -> Dict:
         """Calculate EU ETS impact and benefits"""
         
-        country = site_data.get('country', '')
-        if country not in self.eu_countries:
-            return {'error': 'Site not in EU'}
-        
-        # Get current ETS price
-        current_year = str(datetime.now().year)
-        ets_price = self.ets_price_trends.get(current_year, 85.0)
+        ets_impact = self._eu_ets_impact(site_data.get('country', ''), project_co2_reduction)
+        self._log_eu_ets_impact(site_data, ets_impact)
+        return ets_impact
+    
+    def _eu_ets_impact(self, country: str, project_co2_reduction: float) -> Dict:
+        """EU ETS impact for a site in country (not logged)"""
         
-        # Calculate annual ETS savings
-        annual_ets_savings = project_co2_reduction * ets_price
+        if country not in self._eu_countries_set:
+            return {'error': 'Site not in EU'}
         
-        # Project future savings (assuming price increases)
-        future_savings = {}
-        for year, price in self.ets_price_trends.items():
-            if int(year) > datetime.now().year:
-                future_savings[year] = project_co2_reduction * price
+        projection = self.project_ets_savings(project_co2_reduction)
+        ets_price = projection.current_price_eur_ton
+        annual_ets_savings = projection.annual_savings_eur
+        future_savings = dict(zip(projection.future_years.astype(str).tolist(), projection.future_savings_eur.tolist()))
         
         # Calculate total 5-year savings
-        total_5yr_savings = sum(future_savings.values())
+        total_5yr_savings = projection.future_savings_eur.sum().item()
         
         ets_impact = {
             'current_ets_price_eur_ton': ets_price,
@@ -144,30 +234,34 @@ class EUPolicyEngine:
             'carbon_market_exposure': 'Direct exposure to EU carbon pricing'
         }
         
-        logger.info(f"EU ETS impact calculated for {site_data.get('name', 'Unknown site')}")
-        logger.info(f"  Annual savings: €{annual_ets_savings:,.0f}")
-        logger.info(f"  5-year savings: €{total_5yr_savings:,.0f}")
-        
         return ets_impact
     
+    def _log_eu_ets_impact(self, site_data: Dict, ets_impact: Dict) -> None:
+        if 'error' in ets_impact or not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(f"EU ETS impact calculated for {site_data.get('name', 'Unknown site')}")
+        logger.info(f"  Annual savings: €{ets_impact['annual_ets_savings_eur']:,.0f}")
+        logger.info(f"  5-year savings: €{ets_impact['total_5yr_savings_eur']:,.0f}")
+    
     def assess_cbam_applicability(self, 
                                  site_data: Dict,
                                  product_type: str,
                                  carbon_intensity: float) -> Dict:
         """Assess CBAM applicability and impact"""
         
-        country = site_data.get('country', '')
-        if country not in self.eu_countries:
+        cbam_impact = self._cbam_applicability(site_data.get('country', ''), product_type, carbon_intensity)
+        self._log_cbam_applicability(site_data, cbam_impact)
+        return cbam_impact
+    
+    def _cbam_applicability(self, country: str, product_type: str, carbon_intensity: float) -> Dict:
+        """CBAM applicability for a site in country (not logged)"""
+        
+        if country not in self._eu_countries_set:
             return {'error': 'Site not in EU'}
         
         # Check if product is in CBAM scope
-        cbam_applicable = False
-        applicable_sectors = []
-        
-        for sector, products in self.cbam_sectors.items():
-            if product_type.lower() in [p.lower() for p in products]:
-                cbam_applicable = True
-                applicable_sectors.append(sector)
+        applicable_sectors = list(self._product_to_sectors.get(product_type.lower(), ()))
+        cbam_applicable = bool(applicable_sectors)
         
         # Calculate CBAM impact
         cbam_impact = {
@@ -179,13 +273,16 @@ class EUPolicyEngine:
             'border_adjustment_benefit': 'Reduces import competition' if cbam_applicable else 'No direct benefit'
         }
         
-        if cbam_applicable:
+        return cbam_impact
+    
+    def _log_cbam_applicability(self, site_data: Dict, cbam_impact: Dict) -> None:
+        if 'error' in cbam_impact or not logger.isEnabledFor(logging.INFO):
+            return
+        if cbam_impact['cbam_applicable']:
             logger.info(f"CBAM applicable for {site_data.get('name', 'Unknown site')}")
-            logger.info(f"  Applicable sectors: {', '.join(applicable_sectors)}")
+            logger.info(f"  Applicable sectors: {', '.join(cbam_impact['applicable_sectors'])}")
         else:
             logger.info(f"CBAM not applicable for {site_data.get('name', 'Unknown site')}")
-        
-        return cbam_impact
     
     def calculate_green_deal_alignment(self, 
                                      site_data: Dict,
@@ -193,8 +290,16 @@ class EUPolicyEngine:
                                      energy_efficiency_score: float) -> Dict:
         """Calculate Green Deal alignment score and benefits"""
         
-        country = site_data.get('country', '')
-        if country not in self.eu_countries:
+        green_deal_analysis = self._green_deal_alignment(
+            site_data.get('country', ''), renewable_energy_share, energy_efficiency_score
+        )
+        self._log_green_deal_alignment(site_data, green_deal_analysis)
+        return green_deal_analysis
+    
+    def _green_deal_alignment(self, country: str, renewable_energy_share: float, energy_efficiency_score: float) -> Dict:
+        """Green Deal alignment for a site in country (not logged)"""
+        
+        if country not in self._eu_countries_set:
             return {'error': 'Site not in EU'}
         
         # Green Deal targets
@@ -235,16 +340,26 @@ class EUPolicyEngine:
             ] if overall_alignment >= 60 else ['Limited benefits available']
         }
         
-        logger.info(f"Green Deal alignment calculated for {site_data.get('name', 'Unknown site')}")
-        logger.info(f"  Overall alignment: {overall_alignment:.1f}/100 ({alignment_level})")
-        logger.info(f"  Funding priority: {funding_priority}")
-        
         return green_deal_analysis
     
+    def _log_green_deal_alignment(self, site_data: Dict, green_deal_analysis: Dict) -> None:
+        if 'error' in green_deal_analysis or not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(f"Green Deal alignment calculated for {site_data.get('name', 'Unknown site')}")
+        logger.info(f"  Overall alignment: {green_deal_analysis['overall_alignment_score']:.1f}/100 "
+                    f"({green_deal_analysis['alignment_level']})")
+        logger.info(f"  Funding priority: {green_deal_analysis['funding_priority']}")
+    
     def assess_regional_incentives(self, site_data: Dict) -> Dict:
         """Assess available regional incentives and grants"""
         
-        country = site_data.get('country', '')
+        regional_analysis = self._regional_incentives(site_data.get('country', ''))
+        self._log_regional_incentives(site_data, regional_analysis)
+        return regional_analysis
+    
+    def _regional_incentives(self, country: str) -> Dict:
+        """Regional incentives for a site in country (not logged)"""
+        
         if country not in self.regional_incentives:
             return {'error': 'No incentive data available for this country'}
         
@@ -283,39 +398,42 @@ class EUPolicyEngine:
             'application_complexity': 'Medium' if len(country_incentives['grants']) > 1 else 'Low'
         }
         
-        logger.info(f"Regional incentives assessed for {site_data.get('name', 'Unknown site')}")
-        logger.info(f"  Country: {country}")
-        logger.info(f"  Available grants: {len(country_incentives['grants'])}")
-        logger.info(f"  Potential grant: €{potential_grant:,.0f}")
-        logger.info(f"  Attractiveness: {attractiveness}")
-        
         return regional_analysis
     
+    def _log_regional_incentives(self, site_data: Dict, regional_analysis: Dict) -> None:
+        if 'error' in regional_analysis or not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(f"Regional incentives assessed for {site_data.get('name', 'Unknown site')}")
+        logger.info(f"  Country: {regional_analysis['country']}")
+        logger.info(f"  Available grants: {len(regional_analysis['available_grants'])}")
+        logger.info(f"  Potential grant: €{regional_analysis['potential_grant_amount_eur']:,.0f}")
+        logger.info(f"  Attractiveness: {regional_analysis['incentive_attractiveness']}")
+    
     def calculate_policy_risk_score(self, 
                                    site_data: Dict,
                                    project_lifetime_years: int = 20) -> Dict:
         """Calculate policy risk assessment score"""
         
-        country = site_data.get('country', '')
-        if country not in self.eu_countries:
+        risk_assessment = self._policy_risk_score(site_data.get('country', ''), project_lifetime_years)
+        self._log_policy_risk_score(site_data, risk_assessment)
+        return risk_assessment
+    
+    def _policy_risk_score(self, country: str, project_lifetime_years: int = 20) -> Dict:
+        """Policy risk assessment for a site in country (not logged)"""
+        
+        if country not in self._eu_countries_set:
             return {'error': 'Site not in EU'}
         
         # Base policy stability
         base_stability = self.regional_incentives.get(country, {}).get('policy_stability', 70)
         
         # Policy risk factors
-        risk_factors = {
-            'eu_parliament_elections': 5,  # Elections every 5 years
-            'national_elections': 3,       # National elections
-            'regulatory_changes': 8,      # EU regulatory updates
-            'market_volatility': 4        # Carbon market fluctuations
-        }
+        risk_factors = dict(_POLICY_RISK_FACTORS)
         
-        # Calculate risk over project lifetime
-        total_risk_score = 0
-        for factor, risk_weight in risk_factors.items():
-            factor_occurrences = project_lifetime_years // 5  # Assume major changes every 5 years
-            total_risk_score += factor_occurrences * risk_weight
+        # Calculate risk over project lifetime: every factor recurs once per
+        # 5 years (assume major changes every 5 years), so weights sum up front
+        factor_occurrences = project_lifetime_years // 5
+        total_risk_score = factor_occurrences * _POLICY_RISK_WEIGHT_TOTAL
         
         # Normalize risk score to 0-100
         normalized_risk = min(100, max(0, total_risk_score))
@@ -358,18 +476,54 @@ class EUPolicyEngine:
             ]
         }
         
+        return risk_assessment
+    
+    def _log_policy_risk_score(self, site_data: Dict, risk_assessment: Dict) -> None:
+        if 'error' in risk_assessment or not logger.isEnabledFor(logging.INFO):
+            return
         logger.info(f"Policy risk assessment for {site_data.get('name', 'Unknown site')}")
-        logger.info(f"  Risk score: {normalized_risk:.1f}/100 ({risk_level})")
-        logger.info(f"  Risk description: {risk_description}")
+        logger.info(f"  Risk score: {risk_assessment['policy_risk_score']:.1f}/100 ({risk_assessment['risk_level']})")
+        logger.info(f"  Risk description: {risk_assessment['risk_description']}")
+    
+    def _compute_policy_analysis_core(self, 
+                                      country: str,
+                                      co2_reduction: float,
+                                      product_type: str,
+                                      carbon_intensity: float,
+                                      renewable_energy: float,
+                                      energy_efficiency: float,
+                                      project_lifetime: int) -> Dict:
+        """Run the site-independent policy analyses"""
+        
+        # Unlogged variants; the caller logs the results under the site's name
+        ets_analysis = self._eu_ets_impact(country, co2_reduction)
+        cbam_analysis = self._cbam_applicability(country, product_type, carbon_intensity)
+        green_deal_analysis = self._green_deal_alignment(country, renewable_energy, energy_efficiency)
+        regional_analysis = self._regional_incentives(country)
+        risk_analysis = self._policy_risk_score(country, project_lifetime)
         
-        return risk_assessment
+        # Calculate overall policy score
+        policy_scores = [
+            green_deal_analysis.get('overall_alignment_score', 0),
+            regional_analysis.get('policy_stability_score', 0),
+            (100 - risk_analysis.get('policy_risk_score', 0))  # Invert risk to score
+        ]
+        
+        return {
+            'overall_policy_score': sum(policy_scores) / len(policy_scores),
+            'eu_ets_analysis': ets_analysis,
+            'cbam_analysis': cbam_analysis,
+            'green_deal_analysis': green_deal_analysis,
+            'regional_incentives': regional_analysis,
+            'policy_risk_assessment': risk_analysis
+        }
     
     def generate_comprehensive_policy_analysis(self, 
                                              site_data: Dict,
                                              project_data: Dict) -> Dict:
         """Generate comprehensive EU policy analysis for a site"""
         
-        logger.info(f"Generating comprehensive EU policy analysis for {site_data.get('name', 'Unknown site')}")
+        logger.info("Generating comprehensive EU policy analysis for %s", site_data.get('name', 'Unknown site'))
         
         # Extract project parameters
         co2_reduction = project_data.get('co2_reduction_tpy', 100)
@@ -379,21 +533,25 @@ class EUPolicyEngine:
         energy_efficiency = project_data.get('energy_efficiency_score', 70)
         project_lifetime = project_data.get('project_lifetime_years', 20)
         
-        # Run all analyses
-        ets_analysis = self.calculate_eu_ets_impact(site_data, co2_reduction)
-        cbam_analysis = self.assess_cbam_applicability(site_data, product_type, carbon_intensity)
-        green_deal_analysis = self.calculate_green_deal_alignment(site_data, renewable_energy, energy_efficiency)
-        regional_analysis = self.assess_regional_incentives(site_data)
-        risk_analysis = self.calculate_policy_risk_score(site_data, project_lifetime)
-        
-        # Calculate overall policy score
-        policy_scores = [
-            green_deal_analysis.get('overall_alignment_score', 0),
-            regional_analysis.get('policy_stability_score', 0),
-            (100 - risk_analysis.get('policy_risk_score', 0))  # Invert risk to score
-        ]
-        
-        overall_policy_score = sum(policy_scores) / len(policy_scores)
+        # Run all analyses (they depend only on the country and project parameters)
+        core = self._compute_policy_analysis_core(
+            site_data.get('country', ''), co2_reduction, product_type, carbon_intensity,
+            renewable_energy, energy_efficiency, project_lifetime
+        )
+        
+        overall_policy_score = core['overall_policy_score']
+        ets_analysis = core['eu_ets_analysis']
+        cbam_analysis = core['cbam_analysis']
+        green_deal_analysis = core['green_deal_analysis']
+        regional_analysis = core['regional_incentives']
+        risk_analysis = core['policy_risk_assessment']
+        
+        # Log each analysis under this site's name
+        self._log_eu_ets_impact(site_data, ets_analysis)
+        self._log_cbam_applicability(site_data, cbam_analysis)
+        self._log_green_deal_alignment(site_data, green_deal_analysis)
+        self._log_regional_incentives(site_data, regional_analysis)
+        self._log_policy_risk_score(site_data, risk_analysis)
         
         # Compile comprehensive analysis
         comprehensive_analysis = {
@@ -423,11 +581,105 @@ class EUPolicyEngine:
             ]
         }
         
-        logger.info(f"Comprehensive policy analysis complete")
-        logger.info(f"  Overall policy score: {overall_policy_score:.1f}/100")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Comprehensive policy analysis complete")
+            logger.info(f"  Overall policy score: {overall_policy_score:.1f}/100")
         
         return comprehensive_analysis
     
+    def generate_policy_analysis_portfolio(self, 
+                                           sites: List[Dict],
+                                           projects: List[Dict]) -> List[Dict]:
+        """Generate comprehensive policy analyses for many (site, project) pairs"""
+        
+        # Each pair takes microseconds, so a serial loop beats any worker pool's start-up cost
+        return [self.generate_comprehensive_policy_analysis(site, project)
+                for site, project in zip(sites, projects)]
+    
+    def generate_batch_policy_analysis(self, 
+                                       sites_df: pd.DataFrame,
+                                       projects_df: pd.DataFrame) -> pd.DataFrame:
+        """Generate headline EU policy metrics for many sites (row i of projects_df belongs to row i of sites_df)"""
+        
+        # Scores follow generate_comprehensive_policy_analysis: analyses that do not apply
+        # to a site (non-EU country, no incentive data) contribute 0 to the overall score
+        n_sites = len(sites_df)
+        if len(projects_df) != n_sites:
+            raise ValueError("sites_df and projects_df must have the same number of rows")
+        
+        def project_column(name, default):
+            if name not in projects_df:
+                return np.full(n_sites, default, dtype=np.float64)
+            return projects_df[name].fillna(default).to_numpy(dtype=np.float64)
+        
+        countries = sites_df['country'].astype(object).fillna('').astype(str) if 'country' in sites_df else pd.Series([''] * n_sites)
+        countries = countries.reset_index(drop=True)
+        
+        # Per-country values are looked up once per distinct country and gathered by country code
+        country_codes, unique_countries = pd.factorize(countries)
+        unique_countries = pd.Series(unique_countries, dtype=object)
+        
+        def country_lookup(values):
+            return unique_countries.map(values).to_numpy(dtype=np.float64)[country_codes]
+        
+        in_eu = unique_countries.isin(self._eu_countries_set).to_numpy()[country_codes]
+        
+        co2_reduction = project_column('co2_reduction_tpy', 100)
+        renewable_energy = project_column('renewable_energy_share', 25)
+        energy_efficiency = project_column('energy_efficiency_score', 70)
+        project_lifetime = project_column('project_lifetime_years', 20)
+        
+        # EU ETS savings
+        projection = self.project_ets_savings(co2_reduction)
+        ets_price = projection.current_price_eur_ton
+        annual_ets_savings = np.where(in_eu, projection.annual_savings_eur, np.nan)
+        total_5yr_savings = np.where(in_eu, projection.future_savings_eur.sum(axis=-1), np.nan)
+        
+        # CBAM scope
+        if 'product_type' in projects_df:
+            product_types = projects_df['product_type'].fillna('chemicals').astype(str).str.lower()
+        else:
+            product_types = pd.Series(['chemicals'] * n_sites)
+        cbam_applicable = in_eu & product_types.isin(self._product_to_sectors.keys()).to_numpy()
+        
+        # Green Deal alignment
+        renewable_score = np.minimum(100, (renewable_energy / 42.5) * 100)
+        efficiency_score = np.minimum(100, (energy_efficiency / 32.5) * 100)
+        alignment = np.where(in_eu, renewable_score * 0.6 + efficiency_score * 0.4, 0.0)
+        alignment_level = np.select([alignment >= 80, alignment >= 60], ['High', 'Medium'], 'Low')
+        
+        # Regional incentives
+        has_incentives = unique_countries.isin(self._country_stability.index).to_numpy()[country_codes]
+        stability = np.nan_to_num(country_lookup(self._country_stability), nan=0.0)
+        tax_benefits = country_lookup(self._country_tax)
+        potential_grant = country_lookup(self._country_grant)
+        
+        # Policy risk (every risk factor changes once per 5 years of project lifetime)
+        risk_score = np.clip((project_lifetime // 5) * _POLICY_RISK_WEIGHT_TOTAL, 0, 100)
+        risk_score = np.where(in_eu, risk_score, 0.0)
+        risk_level = np.select([risk_score <= 25, risk_score <= 50, risk_score <= 75], ['Low', 'Medium', 'High'], 'Very High')
+        
+        overall_policy_score = (alignment + stability + (100 - risk_score)) / 3
+        
+        return pd.DataFrame({
+            'name': sites_df['name'].to_numpy() if 'name' in sites_df else np.full(n_sites, 'Unknown'),
+            'country': countries.to_numpy(),
+            'eu_member': in_eu,
+            'overall_policy_score': overall_policy_score,
+            'current_ets_price_eur_ton': np.where(in_eu, ets_price, np.nan),
+            'annual_ets_savings_eur': annual_ets_savings,
+            'total_5yr_savings_eur': total_5yr_savings,
+            'cbam_applicable': cbam_applicable,
+            'green_deal_alignment_score': alignment,
+            'green_deal_alignment_level': np.where(in_eu, alignment_level, None),
+            'regional_incentives_available': has_incentives,
+            'policy_stability_score': np.where(has_incentives, stability, np.nan),
+            'tax_incentives_percentage': tax_benefits,
+            'potential_grant_amount_eur': potential_grant,
+            'policy_risk_score': np.where(in_eu, risk_score, np.nan),
+            'policy_risk_level': np.where(in_eu, risk_level, None)
+        })
+    
     def export_policy_analysis(self, 
                                analysis: Dict, 
                                filename: str = None) -> str:
@@ -457,18 +709,45 @@ class EUPolicyEngine:
                 analysis['policy_risk_assessment']['risk_level']
             ]
         }
-        summary_df = pd.DataFrame(summary_data)
         
-        # Export to Excel
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
+        # Each detail sheet is a header row of keys and a single row of values;
+        # nested values (lists/dicts) are written as their string form
+        detail_sheets = {
+            'EU_ETS_Analysis': analysis['eu_ets_analysis'],
+            'CBAM_Analysis': analysis['cbam_analysis'],
+            'Green_Deal_Analysis': analysis['green_deal_analysis'],
+            'Regional_Incentives': analysis['regional_incentives'],
+            'Policy_Risk_Assessment': analysis['policy_risk_assessment']
+        }
+        
+        # Build sheet rows directly instead of a DataFrame per sheet
+        sheets = {'Summary': [list(summary_data), *zip(*summary_data.values())]}
+        for sheet_name, section in detail_sheets.items():
+            sheets[sheet_name] = [
+                list(section),
+                [str(value) if isinstance(value, (dict, list, tuple, set)) else value for value in section.values()]
+            ]
+        
+        # Export to Excel: xlsxwriter in constant-memory mode when available, else openpyxl write-only
+        if xlsxwriter is not None:
+            workbook = xlsxwriter.Workbook(filename, {
+                'constant_memory': True,
+                'tmpdir': tempfile.gettempdir()
+            })
+            for sheet_name, rows in sheets.items():
+                worksheet = workbook.add_worksheet(sheet_name)
+                for row_idx, row in enumerate(rows):
+                    worksheet.write_row(row_idx, 0, row)
+            workbook.close()
+        else:
+            from openpyxl import Workbook
             
-            # Add detailed sheets
-            pd.DataFrame([analysis['eu_ets_analysis']]).to_excel(writer, sheet_name='EU_ETS_Analysis', index=False)
-            pd.DataFrame([analysis['cbam_analysis']]).to_excel(writer, sheet_name='CBAM_Analysis', index=False)
-            pd.DataFrame([analysis['green_deal_analysis']]).to_excel(writer, sheet_name='Green_Deal_Analysis', index=False)
-            pd.DataFrame([analysis['regional_incentives']]).to_excel(writer, sheet_name='Regional_Incentives', index=False)
-            pd.DataFrame([analysis['policy_risk_assessment']]).to_excel(writer, sheet_name='Policy_Risk_Assessment', index=False)
+            workbook = Workbook(write_only=True)
+            for sheet_name, rows in sheets.items():
+                worksheet = workbook.create_sheet(sheet_name)
+                for row in rows:
+                    worksheet.append(row)
+            workbook.save(filename)
         
         logger.info(f"Policy analysis exported to {filename}")
         return filename
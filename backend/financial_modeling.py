@@ -5,16 +5,254 @@ Calculates ROI, NPV, host value stack, and commercial structure analysis
 
 import pandas as pd
 import numpy as np
+from scipy.optimize import brentq
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, fields
 import logging
 from datetime import datetime, timedelta
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Share of full capacity (revenue and OPEX) reached during the ramp-up period
+_RAMP_UP_FACTOR = 0.5
+
+# IRR search bracket (as decimal rates)
+_IRR_LOW, _IRR_HIGH = -0.99, 10.0
+
+# On-disk memo of whole-project analyses: off unless CARBONSITE_CACHE_DIR names a directory
+# (least recently used entries are evicted)
+_ANALYSIS_CACHE_ENV = 'CARBONSITE_CACHE_DIR'
+_ANALYSIS_CACHE_MAX_ENTRIES = 1000
+
+def _net_cash_flow_kernel(total_capex, total_opex, total_revenue, lifetime, construction, ramp_up):
+    """Net cash flow per year for the construction / ramp-up / operation profile"""
+    operation_start = construction + ramp_up
+    n_years = operation_start + max(0, lifetime - operation_start)
+    net = np.empty(n_years)
+    for i in range(n_years):
+        if i < construction:
+            net[i] = -total_capex / construction
+        elif i < operation_start:
+            net[i] = total_revenue * _RAMP_UP_FACTOR - total_opex * _RAMP_UP_FACTOR
+        else:
+            net[i] = total_revenue - total_opex
+    return net
+
+def _npv_kernel(net, rate):
+    """NPV of yearly net cash flows and its derivative with respect to the rate"""
+    inv = 1.0 / (1.0 + rate)
+    factor = 1.0  # (1 + rate) ** -i, updated by one multiply per year instead of a pow
+    npv = 0.0
+    d_npv = 0.0
+    for i in range(net.shape[0]):
+        npv += net[i] * factor
+        d_npv -= i * net[i] * factor * inv
+        factor *= inv
+    return npv, d_npv
+
+def _irr_kernel(net):
+    """IRR (%) by Newton steps safeguarded with bisection inside the search bracket"""
+    if net.shape[0] < 2:
+        return 0.0
+    low, high = _IRR_LOW, _IRR_HIGH
+    f_low = _npv_kernel(net, low)[0]
+    f_high = _npv_kernel(net, high)[0]
+    if np.sign(f_low) == np.sign(f_high):
+        return 0.0  # No sign change: IRR is undefined
+    rate = 0.1
+    for _ in range(200):
+        f, d_f = _npv_kernel(net, rate)
+        if f == 0.0:
+            return rate * 100
+        if np.sign(f) == np.sign(f_low):
+            low = rate
+        else:
+            high = rate
+        candidate = rate - f / d_f if d_f != 0.0 else low
+        if not low < candidate < high:
+            candidate = 0.5 * (low + high)
+        if abs(candidate - rate) < 1e-10:
+            return candidate * 100
+        rate = candidate
+    return rate * 100
+
+def _cash_flow_metrics_kernel(net, discount_rate):
+    """NPV, IRR (%) and payback period (years) of yearly net cash flows"""
+    npv = _npv_kernel(net, discount_rate)[0]
+    irr = _irr_kernel(net)
+    payback = net.shape[0]  # Never pays back
+    cumulative = 0.0
+    for i in range(net.shape[0]):
+        cumulative += net[i]
+        if cumulative >= 0:
+            payback = i
+            break
+    return npv, irr, payback
+
+def _compute_metrics_kernel(total_capex, total_opex, total_revenue, lifetime, construction, ramp_up, discount_rate):
+    """NPV, IRR (%), payback period (years) and annual ROI (%) of one project"""
+    net = _net_cash_flow_kernel(total_capex, total_opex, total_revenue, lifetime, construction, ramp_up)
+    npv, irr, payback = _cash_flow_metrics_kernel(net, discount_rate)
+    roi = (total_revenue - total_opex) / total_capex * 100 if total_capex > 0 else 0.0
+    return npv, irr, payback, roi
+
+def _batch_metrics_kernel(total_capex, total_opex, total_revenue, lifetime, construction, ramp_up, discount_rate):
+    """NPV, IRR (%), payback period (years) and annual ROI (%) arrays, one project per element"""
+    n_projects = total_capex.shape[0]
+    npv = np.empty(n_projects)
+    irr = np.empty(n_projects)
+    payback = np.empty(n_projects, dtype=np.int64)
+    roi = np.empty(n_projects)
+    for k in range(n_projects):
+        metrics = _compute_metrics_kernel(
+            total_capex[k], total_opex[k], total_revenue[k],
+            lifetime[k], construction[k], ramp_up[k], discount_rate[k]
+        )
+        npv[k] = metrics[0]
+        irr[k] = metrics[1]
+        payback[k] = metrics[2]
+        roi[k] = metrics[3]
+    return npv, irr, payback, roi
+
+def _capex_components(equipment_cost, installation_factor, engineering_factor, contingency_factor):
+    """Installation, engineering, contingency and total CAPEX (scalars or arrays)"""
+    installation_capex = equipment_cost * installation_factor
+    engineering_capex = equipment_cost * engineering_factor
+    contingency_capex = equipment_cost * contingency_factor
+    total_capex = equipment_cost + installation_capex + engineering_capex + contingency_capex
+    return installation_capex, engineering_capex, contingency_capex, total_capex
+
+def _opex_components(co_output_tpy, total_capex,
+                     power_price_eur_mwh, power_consumption_mwh_per_ton_co,
+                     water_consumption_m3_per_ton_co, water_price_eur_m3,
+                     labor_hours_per_ton_co, labor_rate_eur_per_hour,
+                     maintenance_factor, insurance_factor):
+    """Electricity, water, labor, maintenance, insurance and total OPEX per year (scalars or arrays)"""
+    # Combine the per-ton rates first so an array of CO outputs is multiplied once per component
+    co = co_output_tpy
+    electricity_cost = co * (power_consumption_mwh_per_ton_co * power_price_eur_mwh)
+    water_cost = co * (water_consumption_m3_per_ton_co * water_price_eur_m3)
+    labor_cost = co * (labor_hours_per_ton_co * labor_rate_eur_per_hour)
+    
+    # Maintenance and insurance (as % of total CAPEX)
+    maintenance_cost = total_capex * maintenance_factor
+    insurance_cost = total_capex * insurance_factor
+    
+    total_opex = electricity_cost + water_cost + labor_cost + maintenance_cost + insurance_cost
+    return electricity_cost, water_cost, labor_cost, maintenance_cost, insurance_cost, total_opex
+
+def _revenue_components(co2_input_tpy, co_output_tpy, co_price_eur_per_ton, carbon_credit_volume_tpy,
+                        carbon_credit_price_eur_ton, eu_ets_price_eur_ton):
+    """CO sales, carbon credit, avoided CO₂ cost and total revenue per year (scalars or arrays)"""
+    co_sales_revenue = co_output_tpy * co_price_eur_per_ton
+    
+    # Carbon credits revenue (assume CO₂ avoidance equals CO₂ input unless a volume is given)
+    if np.ndim(carbon_credit_volume_tpy) == 0 and np.ndim(co2_input_tpy) == 0:
+        # Scalar inputs: a plain conditional keeps Python numbers in the model's metrics
+        credit_volume = carbon_credit_volume_tpy if carbon_credit_volume_tpy else co2_input_tpy
+    else:
+        # Arrays of scenarios: branchless and element-wise, None, NaN or 0 meaning no volume given
+        volume = np.asarray(np.nan if carbon_credit_volume_tpy is None else carbon_credit_volume_tpy, dtype=np.float64)
+        credit_volume = np.where(np.isnan(volume) | (volume == 0), co2_input_tpy, volume)
+    carbon_credits_revenue = credit_volume * carbon_credit_price_eur_ton
+    
+    # Avoided CO₂ costs (EU ETS savings)
+    avoided_co2_costs = co2_input_tpy * eu_ets_price_eur_ton
+    
+    total_revenue = co_sales_revenue + carbon_credits_revenue + avoided_co2_costs
+    return co_sales_revenue, carbon_credits_revenue, avoided_co2_costs, total_revenue
+
+def _analysis_cache_dir() -> Optional[str]:
+    """Directory of the on-disk analysis cache, or None when caching is not configured"""
+    return os.environ.get(_ANALYSIS_CACHE_ENV) or None
+
+@functools.lru_cache(maxsize=1)
+def _code_fingerprint() -> str:
+    """Hash of this module's source, so any change to the formulas or pickled classes misses the cache"""
+    with open(__file__, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+def _analysis_cache_key(project_params, inputs: Dict) -> str:
+    """Stable hash of the model code, project parameters and cost inputs of an analysis"""
+    payload = repr((_code_fingerprint(), sorted(asdict(project_params).items()), sorted(inputs.items())))
+    return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+def _load_cached_analysis(cache_dir: str, key: str):
+    """Load a persisted analysis and mark it as recently used (None on a miss)"""
+    path = os.path.join(cache_dir, f"{key}.pkl")
+    try:
+        with open(path, 'rb') as f:
+            cached = pickle.load(f)
+        os.utime(path)
+        return cached
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+def _store_cached_analysis(cache_dir: str, key: str, analysis) -> None:
+    """Persist an analysis atomically, then evict the least recently used entries over the limit"""
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile('wb', dir=cache_dir, suffix='.tmp', delete=False) as f:
+            pickle.dump(analysis, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, os.path.join(cache_dir, f"{key}.pkl"))
+        
+        entries = [entry for entry in os.scandir(cache_dir) if entry.name.endswith('.pkl')]
+        if len(entries) > _ANALYSIS_CACHE_MAX_ENTRIES:
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in entries[:len(entries) - _ANALYSIS_CACHE_MAX_ENTRIES]:
+                os.remove(entry.path)
+    except OSError as e:
+        logger.warning(f"Could not persist financial analysis: {e}")
+
+@functools.lru_cache(maxsize=256)
+def _discount_vector(rate: float, n_years: int) -> np.ndarray:
+    """Read-only discount factors (1 + rate) ** year for years 0..n_years-1"""
+    discount = np.power(1.0 + rate, np.arange(n_years))
+    discount.flags.writeable = False
+    return discount
+
+@functools.lru_cache(maxsize=256)
+def _period_discount_weights(rate: float, construction: int, ramp_up: int, n_years: int) -> Tuple[float, float, float]:
+    """Summed discount factors of the construction, ramp-up and operation years
+    
+    Cash flows are constant within each period, so for a given (rate, period shape) the NPV
+    reduces to three multiply-adds; the default 20/2/1-year shape is always a cache hit.
+    """
+    weights = 1.0 / _discount_vector(rate, n_years)
+    operation_start = construction + ramp_up
+    return (float(weights[:construction].sum()),
+            float(weights[construction:operation_start].sum()),
+            float(weights[operation_start:].sum()))
+
+# Compile the metric kernels when numba is installed (sensitivity sweeps call them many times)
+if njit is not None:
+    _net_cash_flow_kernel = njit(cache=True)(_net_cash_flow_kernel)
+    _npv_kernel = njit(cache=True)(_npv_kernel)
+    _irr_kernel = njit(cache=True)(_irr_kernel)
+    _cash_flow_metrics_kernel = njit(cache=True)(_cash_flow_metrics_kernel)
+    _compute_metrics_kernel = njit(cache=True)(_compute_metrics_kernel)
+    _batch_metrics_kernel = njit(cache=True)(_batch_metrics_kernel)
+
+@dataclass(slots=True)
 class ProjectParameters:
     """FOAK pilot project parameters"""
     project_name: str
@@ -35,7 +273,7 @@ class ProjectParameters:
     cbam_applicable: bool = True
     carbon_credit_price_eur_ton: float = 85.0
 
-@dataclass
+@dataclass(slots=True)
 class CostStructure:
     """Detailed cost structure for the FOAK pilot"""
     # Capital costs (€)
@@ -59,15 +297,151 @@ class CostStructure:
     avoided_co2_costs: float
     total_revenue: float
 
+@dataclass
+class CashFlowProjection:
+    """Yearly cash flow projection stored as one NumPy array per column"""
+    year: np.ndarray
+    period_type: np.ndarray  # uint8 code into PERIOD_TYPES
+    period_index: np.ndarray  # 1-based year within the period
+    capex: np.ndarray
+    opex: np.ndarray
+    revenue: np.ndarray
+    net_cash_flow: np.ndarray
+    cumulative_cash_flow: np.ndarray
+    
+    PERIOD_TYPES = ('Construction', 'Ramp-up', 'Operation')
+    
+    def period_labels(self) -> List[str]:
+        """Period label of each year ('Construction 1', 'Ramp-up 1', 'Operation 1', ...)"""
+        return [f'{self.PERIOD_TYPES[code]} {index}'
+                for code, index in zip(self.period_type.tolist(), self.period_index.tolist())]
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Build a DataFrame straight from the column arrays (period labels as plain strings)"""
+        return pd.DataFrame({
+            'year': self.year,
+            'period': self.period_labels(),
+            'capex': self.capex,
+            'opex': self.opex,
+            'revenue': self.revenue,
+            'net_cash_flow': self.net_cash_flow,
+            'cumulative_cash_flow': self.cumulative_cash_flow
+        })
+    
+    def to_records(self) -> List[Dict]:
+        """Materialize the projection as one dict per year"""
+        return [
+            {
+                'year': year,
+                'period': period,
+                'capex': capex,
+                'opex': opex,
+                'revenue': revenue,
+                'net_cash_flow': net_cash_flow,
+                'cumulative_cash_flow': cumulative_cash_flow
+            }
+            for year, period, capex, opex, revenue, net_cash_flow, cumulative_cash_flow in zip(
+                self.year.tolist(), self.period_labels(), self.capex.tolist(), self.opex.tolist(),
+                self.revenue.tolist(), self.net_cash_flow.tolist(), self.cumulative_cash_flow.tolist()
+            )
+        ]
+
 class FinancialModel:
     """Main financial modeling engine"""
     
     def __init__(self, project_params: ProjectParameters):
         self.project_params = project_params
         self.cost_structure = None
-        self.cash_flows = []
+        self.cash_flow_projection = None
+        self.financial_metrics = {}
+    
+    @property
+    def cash_flows(self) -> List[Dict]:
+        """Cash flow projection as one dict per year (empty until generated)"""
+        if self.cash_flow_projection is None:
+            return []
+        return self.cash_flow_projection.to_records()
+        
+    def compute(self, 
+                equipment_cost: float,
+                power_price_eur_mwh: float,
+                power_consumption_mwh_per_ton_co: float,
+                water_consumption_m3_per_ton_co: float,
+                water_price_eur_m3: float,
+                labor_hours_per_ton_co: float,
+                labor_rate_eur_per_hour: float,
+                co_price_eur_per_ton: float,
+                carbon_credit_volume_tpy: float = None,
+                installation_factor: float = 0.15,
+                engineering_factor: float = 0.10,
+                contingency_factor: float = 0.20,
+                maintenance_factor: float = 0.03,
+                insurance_factor: float = 0.01) -> CostStructure:
+        """Calculate CAPEX, OPEX and revenue in one pass and use the result as the model's cost structure"""
+        
+        params = self.project_params
+        installation_capex, engineering_capex, contingency_capex, total_capex = _capex_components(
+            equipment_cost, installation_factor, engineering_factor, contingency_factor
+        )
+        (electricity_cost, water_cost, labor_cost,
+         maintenance_cost, insurance_cost, total_opex) = _opex_components(
+            params.co_output_tpy, total_capex,
+            power_price_eur_mwh, power_consumption_mwh_per_ton_co,
+            water_consumption_m3_per_ton_co, water_price_eur_m3,
+            labor_hours_per_ton_co, labor_rate_eur_per_hour,
+            maintenance_factor, insurance_factor
+        )
+        co_sales_revenue, carbon_credits_revenue, avoided_co2_costs, total_revenue = _revenue_components(
+            params.co2_input_tpy, params.co_output_tpy, co_price_eur_per_ton, carbon_credit_volume_tpy,
+            params.carbon_credit_price_eur_ton, params.eu_ets_price_eur_ton
+        )
+        
+        self.cost_structure = CostStructure(
+            equipment_capex=equipment_cost,
+            installation_capex=installation_capex,
+            engineering_capex=engineering_capex,
+            contingency_capex=contingency_capex,
+            total_capex=total_capex,
+            electricity_cost=electricity_cost,
+            water_cost=water_cost,
+            labor_cost=labor_cost,
+            maintenance_cost=maintenance_cost,
+            insurance_cost=insurance_cost,
+            total_opex=total_opex,
+            co_sales_revenue=co_sales_revenue,
+            carbon_credits_revenue=carbon_credits_revenue,
+            avoided_co2_costs=avoided_co2_costs,
+            total_revenue=total_revenue
+        )
+        self.cash_flow_projection = None
         self.financial_metrics = {}
+        return self.cost_structure
+    
+    def analyze(self, use_cache: bool = True, **compute_kwargs) -> Dict:
+        """Run compute(), cash flows and financial metrics
         
+        With use_cache and CARBONSITE_CACHE_DIR set, a result persisted there for identical inputs
+        (and identical model code) is reused instead.
+        """
+        
+        inputs = inspect.signature(self.compute).bind(**compute_kwargs)
+        inputs.apply_defaults()
+        cache_dir = _analysis_cache_dir() if use_cache else None
+        key = _analysis_cache_key(self.project_params, inputs.arguments) if cache_dir else None
+        
+        cached = _load_cached_analysis(cache_dir, key) if cache_dir else None
+        if cached is not None:
+            self.cost_structure, self.cash_flow_projection, self.financial_metrics = cached
+            return self.financial_metrics
+        
+        self.compute(**inputs.arguments)
+        self.generate_cash_flows()
+        self.calculate_financial_metrics()
+        
+        if cache_dir:
+            _store_cached_analysis(cache_dir, key, (self.cost_structure, self.cash_flow_projection, self.financial_metrics))
+        return self.financial_metrics
+    
     def calculate_capex(self, 
                        equipment_cost: float,
                        installation_factor: float = 0.15,
@@ -75,20 +449,20 @@ class FinancialModel:
                        contingency_factor: float = 0.20) -> CostStructure:
         """Calculate detailed capital expenditure structure"""
         
-        installation_capex = equipment_cost * installation_factor
-        engineering_capex = equipment_cost * engineering_factor
-        contingency_capex = equipment_cost * contingency_factor
-        total_capex = equipment_cost + installation_capex + engineering_capex + contingency_capex
+        installation_capex, engineering_capex, contingency_capex, total_capex = _capex_components(
+            equipment_cost, installation_factor, engineering_factor, contingency_factor
+        )
         
         # Calculate annualized capex over construction period
         annual_capex = total_capex / self.project_params.construction_period_years
         
-        logger.info(f"CAPEX breakdown for {self.project_params.project_name}:")
-        logger.info(f"  Equipment: €{equipment_cost:,.0f}")
-        logger.info(f"  Installation: €{installation_capex:,.0f}")
-        logger.info(f"  Engineering: €{engineering_capex:,.0f}")
-        logger.info(f"  Contingency: €{contingency_capex:,.0f}")
-        logger.info(f"  Total CAPEX: €{total_capex:,.0f}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"CAPEX breakdown for {self.project_params.project_name}:")
+            logger.info(f"  Equipment: €{equipment_cost:,.0f}")
+            logger.info(f"  Installation: €{installation_capex:,.0f}")
+            logger.info(f"  Engineering: €{engineering_capex:,.0f}")
+            logger.info(f"  Contingency: €{contingency_capex:,.0f}")
+            logger.info(f"  Total CAPEX: €{total_capex:,.0f}")
         
         return CostStructure(
             equipment_capex=equipment_cost,
@@ -122,23 +496,14 @@ class FinancialModel:
         if not self.cost_structure:
             raise ValueError("CAPEX must be calculated first")
         
-        # Electricity costs
-        total_power_consumption = self.project_params.co_output_tpy * power_consumption_mwh_per_ton_co
-        electricity_cost = total_power_consumption * power_price_eur_mwh
-        
-        # Water costs
-        total_water_consumption = self.project_params.co_output_tpy * water_consumption_m3_per_ton_co
-        water_cost = total_water_consumption * water_price_eur_m3
-        
-        # Labor costs
-        total_labor_hours = self.project_params.co_output_tpy * labor_hours_per_ton_co
-        labor_cost = total_labor_hours * labor_rate_eur_per_hour
-        
-        # Maintenance and insurance (as % of total CAPEX)
-        maintenance_cost = self.cost_structure.total_capex * maintenance_factor
-        insurance_cost = self.cost_structure.total_capex * insurance_factor
-        
-        total_opex = electricity_cost + water_cost + labor_cost + maintenance_cost + insurance_cost
+        (electricity_cost, water_cost, labor_cost,
+         maintenance_cost, insurance_cost, total_opex) = _opex_components(
+            self.project_params.co_output_tpy, self.cost_structure.total_capex,
+            power_price_eur_mwh, power_consumption_mwh_per_ton_co,
+            water_consumption_m3_per_ton_co, water_price_eur_m3,
+            labor_hours_per_ton_co, labor_rate_eur_per_hour,
+            maintenance_factor, insurance_factor
+        )
         
         # Update cost structure
         self.cost_structure.electricity_cost = electricity_cost
@@ -148,13 +513,14 @@ class FinancialModel:
         self.cost_structure.insurance_cost = insurance_cost
         self.cost_structure.total_opex = total_opex
         
-        logger.info(f"OPEX breakdown for {self.project_params.project_name}:")
-        logger.info(f"  Electricity: €{electricity_cost:,.0f}/year")
-        logger.info(f"  Water: €{water_cost:,.0f}/year")
-        logger.info(f"  Labor: €{labor_cost:,.0f}/year")
-        logger.info(f"  Maintenance: €{maintenance_cost:,.0f}/year")
-        logger.info(f"  Insurance: €{insurance_cost:,.0f}/year")
-        logger.info(f"  Total OPEX: €{total_opex:,.0f}/year")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"OPEX breakdown for {self.project_params.project_name}:")
+            logger.info(f"  Electricity: €{electricity_cost:,.0f}/year")
+            logger.info(f"  Water: €{water_cost:,.0f}/year")
+            logger.info(f"  Labor: €{labor_cost:,.0f}/year")
+            logger.info(f"  Maintenance: €{maintenance_cost:,.0f}/year")
+            logger.info(f"  Insurance: €{insurance_cost:,.0f}/year")
+            logger.info(f"  Total OPEX: €{total_opex:,.0f}/year")
     
     def calculate_revenue(self, 
                          co_price_eur_per_ton: float,
@@ -164,20 +530,11 @@ class FinancialModel:
         if not self.cost_structure:
             raise ValueError("Cost structure must be calculated first")
         
-        # CO sales revenue
-        co_sales_revenue = self.project_params.co_output_tpy * co_price_eur_per_ton
-        
-        # Carbon credits revenue (if applicable)
-        if carbon_credit_volume_tpy:
-            carbon_credits_revenue = carbon_credit_volume_tpy * self.project_params.carbon_credit_price_eur_ton
-        else:
-            # Assume CO₂ avoidance equals CO₂ input
-            carbon_credits_revenue = self.project_params.co2_input_tpy * self.project_params.carbon_credit_price_eur_ton
-        
-        # Avoided CO₂ costs (EU ETS savings)
-        avoided_co2_costs = self.project_params.co2_input_tpy * self.project_params.eu_ets_price_eur_ton
-        
-        total_revenue = co_sales_revenue + carbon_credits_revenue + avoided_co2_costs
+        co_sales_revenue, carbon_credits_revenue, avoided_co2_costs, total_revenue = _revenue_components(
+            self.project_params.co2_input_tpy, self.project_params.co_output_tpy,
+            co_price_eur_per_ton, carbon_credit_volume_tpy,
+            self.project_params.carbon_credit_price_eur_ton, self.project_params.eu_ets_price_eur_ton
+        )
         
         # Update cost structure
         self.cost_structure.co_sales_revenue = co_sales_revenue
@@ -185,97 +542,90 @@ class FinancialModel:
         self.cost_structure.avoided_co2_costs = avoided_co2_costs
         self.cost_structure.total_revenue = total_revenue
         
-        logger.info(f"Revenue breakdown for {self.project_params.project_name}:")
-        logger.info(f"  CO Sales: €{co_sales_revenue:,.0f}/year")
-        logger.info(f"  Carbon Credits: €{carbon_credits_revenue:,.0f}/year")
-        logger.info(f"  Avoided CO₂ Costs: €{avoided_co2_costs:,.0f}/year")
-        logger.info(f"  Total Revenue: €{total_revenue:,.0f}/year")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Revenue breakdown for {self.project_params.project_name}:")
+            logger.info(f"  CO Sales: €{co_sales_revenue:,.0f}/year")
+            logger.info(f"  Carbon Credits: €{carbon_credits_revenue:,.0f}/year")
+            logger.info(f"  Avoided CO₂ Costs: €{avoided_co2_costs:,.0f}/year")
+            logger.info(f"  Total Revenue: €{total_revenue:,.0f}/year")
     
-    def generate_cash_flows(self) -> List[Dict]:
+    def generate_cash_flows(self) -> CashFlowProjection:
         """Generate detailed cash flow projections"""
         
         if not self.cost_structure:
             raise ValueError("Cost structure must be calculated first")
         
-        cash_flows = []
-        current_year = 0
+        construction_years = self.project_params.construction_period_years
+        ramp_up_years = self.project_params.ramp_up_period_years
+        operation_start = construction_years + ramp_up_years
+        n_years = operation_start + max(0, self.project_params.project_lifetime_years - operation_start)
+        
+        capex = np.zeros(n_years)
+        opex = np.zeros(n_years)
+        revenue = np.zeros(n_years)
         
         # Construction period (negative cash flows)
-        annual_capex = self.cost_structure.total_capex / self.project_params.construction_period_years
-        for year in range(self.project_params.construction_period_years):
-            cash_flows.append({
-                'year': current_year,
-                'period': f'Construction {year + 1}',
-                'capex': -annual_capex,
-                'opex': 0,
-                'revenue': 0,
-                'net_cash_flow': -annual_capex,
-                'cumulative_cash_flow': -annual_capex * (year + 1)
-            })
-            current_year += 1
+        capex[:construction_years] = -self.cost_structure.total_capex / construction_years
         
         # Ramp-up period (partial revenue)
-        ramp_up_factor = 0.5  # 50% of full capacity
-        for year in range(self.project_params.ramp_up_period_years):
-            revenue = self.cost_structure.total_revenue * ramp_up_factor
-            opex = self.cost_structure.total_opex * ramp_up_factor
-            net_cash_flow = revenue - opex
-            
-            cash_flows.append({
-                'year': current_year,
-                'period': f'Ramp-up {year + 1}',
-                'capex': 0,
-                'opex': -opex,
-                'revenue': revenue,
-                'net_cash_flow': net_cash_flow,
-                'cumulative_cash_flow': cash_flows[-1]['cumulative_cash_flow'] + net_cash_flow
-            })
-            current_year += 1
+        revenue[construction_years:operation_start] = self.cost_structure.total_revenue * _RAMP_UP_FACTOR
+        opex[construction_years:operation_start] = -(self.cost_structure.total_opex * _RAMP_UP_FACTOR)
         
         # Full operation period
-        for year in range(self.project_params.project_lifetime_years - 
-                         self.project_params.construction_period_years - 
-                         self.project_params.ramp_up_period_years):
-            
-            revenue = self.cost_structure.total_revenue
-            opex = self.cost_structure.total_opex
-            net_cash_flow = revenue - opex
-            
-            cash_flows.append({
-                'year': current_year,
-                'period': f'Operation {year + 1}',
-                'capex': 0,
-                'opex': -opex,
-                'revenue': revenue,
-                'net_cash_flow': net_cash_flow,
-                'cumulative_cash_flow': cash_flows[-1]['cumulative_cash_flow'] + net_cash_flow
-            })
-            current_year += 1
-        
-        self.cash_flows = cash_flows
-        return cash_flows
+        revenue[operation_start:] = self.cost_structure.total_revenue
+        opex[operation_start:] = -self.cost_structure.total_opex
+        
+        net_cash_flow = capex + opex + revenue
+        
+        # Period codes (0 construction, 1 ramp-up, 2 operation) and 1-based year within each period
+        year = np.arange(n_years)
+        period_type = np.full(n_years, 2, dtype=np.uint8)
+        period_type[:operation_start] = 1
+        period_type[:construction_years] = 0
+        period_start = np.array([0, construction_years, operation_start])[period_type]
+        period_index = (year - period_start + 1).astype(np.uint16)
+        
+        self.cash_flow_projection = CashFlowProjection(
+            year=year,
+            period_type=period_type,
+            period_index=period_index,
+            capex=capex,
+            opex=opex,
+            revenue=revenue,
+            net_cash_flow=net_cash_flow,
+            cumulative_cash_flow=np.cumsum(net_cash_flow)
+        )
+        return self.cash_flow_projection
     
     def calculate_financial_metrics(self) -> Dict:
         """Calculate key financial metrics"""
         
-        if not self.cash_flows:
+        if self.cash_flow_projection is None:
             self.generate_cash_flows()
         
         # Extract cash flows
-        net_cash_flows = [cf['net_cash_flow'] for cf in self.cash_flows]
-        cumulative_cash_flows = [cf['cumulative_cash_flow'] for cf in self.cash_flows]
+        net_cash_flows = self.cash_flow_projection.net_cash_flow
+        cumulative_cash_flows = self.cash_flow_projection.cumulative_cash_flow
         
-        # Net Present Value (NPV)
-        npv = 0
-        for i, cf in enumerate(net_cash_flows):
-            npv += cf / ((1 + self.project_params.discount_rate) ** i)
-        
-        # Internal Rate of Return (IRR) - simplified calculation
-        # For more accurate IRR, would need to use scipy.optimize.newton
-        irr = self._estimate_irr(net_cash_flows)
-        
-        # Payback Period
-        payback_period = self._calculate_payback_period(cumulative_cash_flows)
+        if njit is not None:
+            # NPV, IRR and payback in one compiled pass
+            npv, irr, payback_period = _cash_flow_metrics_kernel(net_cash_flows, self.project_params.discount_rate)
+        else:
+            # Net Present Value (NPV) from the per-period discount weights
+            construction = self.project_params.construction_period_years
+            period_starts = (0, construction, construction + self.project_params.ramp_up_period_years)
+            weights = _period_discount_weights(
+                self.project_params.discount_rate, construction,
+                self.project_params.ramp_up_period_years, net_cash_flows.size
+            )
+            npv = sum(net_cash_flows[start].item() * weight
+                      for start, weight in zip(period_starts, weights) if start < net_cash_flows.size)
+            
+            # Internal Rate of Return (IRR)
+            irr = self._estimate_irr(net_cash_flows)
+            
+            # Payback Period
+            payback_period = self._calculate_payback_period(cumulative_cash_flows)
         
         # Profitability Index
         total_capex = self.cost_structure.total_capex
@@ -306,59 +656,152 @@ class FinancialModel:
             'annual_profit_eur': annual_profit
         }
         
-        logger.info(f"Financial metrics for {self.project_params.project_name}:")
-        logger.info(f"  NPV: €{npv:,.0f}")
-        logger.info(f"  IRR: {irr:.1f}%")
-        logger.info(f"  Payback Period: {payback_period:.1f} years")
-        logger.info(f"  Annual ROI: {annual_roi:.1f}%")
-        logger.info(f"  Cost per ton CO₂ avoided: €{cost_per_ton_co2_avoided:.2f}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Financial metrics for {self.project_params.project_name}:")
+            logger.info(f"  NPV: €{npv:,.0f}")
+            logger.info(f"  IRR: {irr:.1f}%")
+            logger.info(f"  Payback Period: {payback_period:.1f} years")
+            logger.info(f"  Annual ROI: {annual_roi:.1f}%")
+            logger.info(f"  Cost per ton CO₂ avoided: €{cost_per_ton_co2_avoided:.2f}")
         
         return self.financial_metrics
     
-    def _estimate_irr(self, cash_flows: List[float]) -> float:
-        """Estimate IRR using simplified calculation"""
-        # This is a simplified IRR calculation
-        # For production use, consider using scipy.optimize.newton
+    @staticmethod
+    def batch_metrics(params_df: pd.DataFrame, precision: str = 'fp64') -> pd.DataFrame:
+        """Calculate NPV, IRR, payback and ROI for many projects at once (one row per project)
+        
+        params_df needs total_capex, total_opex and total_revenue columns; discount_rate,
+        project_lifetime_years, construction_period_years and ramp_up_period_years fall back
+        to the ProjectParameters defaults when absent. precision='fp32' halves the memory
+        traffic of the cash flow and discount matrices for large sweeps (NPV error stays
+        within ~1e-4 of CAPEX); the IRR search always runs in float64. With numba installed,
+        fp64 sweeps run the compiled per-project kernel instead of the matrix code.
+        """
+        
+        if precision not in ('fp32', 'fp64'):
+            raise ValueError(f"Unsupported precision: {precision}")
+        dtype = np.float32 if precision == 'fp32' else np.float64
+        
+        defaults = {field.name: field.default for field in fields(ProjectParameters)}
+        
+        def column(name, dtype=np.float64):
+            if name in params_df:
+                return params_df[name].to_numpy(dtype=dtype)
+            return np.full(len(params_df), defaults[name], dtype=dtype)
+        
+        total_capex = column('total_capex')
+        total_opex = column('total_opex')
+        total_revenue = column('total_revenue')
+        discount_rate = column('discount_rate')
+        lifetime = column('project_lifetime_years', np.int64)
+        construction = column('construction_period_years', np.int64)
+        ramp_up = column('ramp_up_period_years', np.int64)
+        
+        if njit is not None and precision == 'fp64':
+            npv, irr, payback, annual_roi = _batch_metrics_kernel(
+                total_capex, total_opex, total_revenue, lifetime, construction, ramp_up, discount_rate
+            )
+            return pd.DataFrame({
+                'npv_eur': npv,
+                'irr_percent': irr,
+                'payback_period_years': payback,
+                'annual_roi_percent': annual_roi
+            }, index=params_df.index)
+        
+        # Net cash flow matrix (projects x years); years past a project's end stay zero
+        operation_start = construction + ramp_up
+        n_years = np.maximum(lifetime, operation_start)
+        t = np.arange(n_years.max(initial=1))
+        in_construction = t < construction[:, None]
+        in_ramp_up = ~in_construction & (t < operation_start[:, None])
+        in_operation = (t >= operation_start[:, None]) & (t < n_years[:, None])
+        construction_flow = (-total_capex / construction).astype(dtype)
+        ramp_up_flow = (total_revenue * _RAMP_UP_FACTOR - total_opex * _RAMP_UP_FACTOR).astype(dtype)
+        operation_flow = (total_revenue - total_opex).astype(dtype)
+        net = np.where(in_construction, construction_flow[:, None], dtype(0.0))
+        net = np.where(in_ramp_up, ramp_up_flow[:, None], net)
+        net = np.where(in_operation, operation_flow[:, None], net)
+        
+        def npv_at(cash_flows, rates, years):
+            return np.sum(cash_flows / (1 + rates[:, None]) ** years, axis=1)
+        
+        npv = npv_at(net, discount_rate.astype(dtype), t.astype(dtype))
+        
+        # IRR by vectorized bisection inside the search bracket (float64: the bracket's
+        # low end discounts by up to 100x per year, which overflows float32)
+        net_fp64 = net.astype(np.float64, copy=False)
+        low = np.full(len(net), _IRR_LOW)
+        high = np.full(len(net), _IRR_HIGH)
+        npv_low = npv_at(net_fp64, low, t)
+        has_irr = (np.sign(npv_low) != np.sign(npv_at(net_fp64, high, t))) & (n_years >= 2)
+        for _ in range(60):
+            mid = 0.5 * (low + high)
+            npv_mid = npv_at(net_fp64, mid, t)
+            same_sign = np.sign(npv_mid) == np.sign(npv_low)
+            low = np.where(same_sign, mid, low)
+            npv_low = np.where(same_sign, npv_mid, npv_low)
+            high = np.where(same_sign, high, mid)
+        irr = np.where(has_irr, 0.5 * (low + high) * 100, 0.0)
+        
+        # Payback period (first year with non-negative cumulative cash flow)
+        paid_back = (np.cumsum(net, axis=1) >= 0) & (t < n_years[:, None])
+        payback = np.where(paid_back.any(axis=1), np.argmax(paid_back, axis=1), n_years)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            annual_roi = np.where(total_capex > 0, (total_revenue - total_opex) / total_capex * 100, 0.0)
+        
+        return pd.DataFrame({
+            'npv_eur': npv,
+            'irr_percent': irr,
+            'payback_period_years': payback,
+            'annual_roi_percent': annual_roi
+        }, index=params_df.index)
+    
+    def _estimate_irr(self, cash_flows: np.ndarray) -> float:
+        """Estimate IRR (%) as the root of the NPV polynomial, bracketed between -99% and 1000%"""
         
-        if len(cash_flows) < 2:
+        cash_flows = np.asarray(cash_flows, dtype=np.float64)
+        if cash_flows.size < 2:
             return 0.0
         
-        # Simple estimation based on average return
-        total_investment = abs(sum([cf for cf in cash_flows if cf < 0]))
-        total_return = sum([cf for cf in cash_flows if cf > 0])
+        periods = np.arange(cash_flows.size)
         
-        if total_investment == 0:
-            return 0.0
+        def npv_at(rate: float) -> float:
+            return float(np.sum(cash_flows / (1.0 + rate) ** periods))
         
-        # Rough IRR estimation
-        avg_return_per_year = total_return / len(cash_flows)
-        irr = (avg_return_per_year / total_investment) * 100
+        low, high = _IRR_LOW, _IRR_HIGH
+        if np.sign(npv_at(low)) == np.sign(npv_at(high)):
+            return 0.0  # No sign change: IRR is undefined (never pays back, or never invests)
         
-        return min(irr, 100.0)  # Cap at 100%
+        return brentq(npv_at, low, high, xtol=1e-10) * 100
     
-    def _calculate_payback_period(self, cumulative_cash_flows: List[float]) -> float:
+    def _calculate_payback_period(self, cumulative_cash_flows: np.ndarray) -> float:
         """Calculate payback period in years"""
         
-        for i, cumulative in enumerate(cumulative_cash_flows):
-            if cumulative >= 0:
-                return i
+        paid_back = np.asarray(cumulative_cash_flows) >= 0
+        if not paid_back.any():
+            return len(paid_back)  # Never pays back
         
-        return len(cumulative_cash_flows)  # Never pays back
+        return int(np.argmax(paid_back))
     
-    def export_financial_analysis(self, filename: str = None) -> str:
-        """Export comprehensive financial analysis to CSV"""
+    def export_financial_analysis(self, filename: str = None, format: str = 'xlsx') -> str:
+        """Export comprehensive financial analysis to Excel, or to CSV files plus a JSON metrics sidecar
         
-        if not self.cash_flows:
+        With format='csv' the summary CSV path is returned; the cash flow CSV and metrics JSON
+        are written next to it with the same stem.
+        """
+        
+        if format not in ('xlsx', 'csv'):
+            raise ValueError(f"Unsupported export format: {format}")
+        
+        if self.cash_flow_projection is None:
             self.generate_cash_flows()
         
         if not self.financial_metrics:
             self.calculate_financial_metrics()
         
         # Create cash flow DataFrame
-        cf_df = pd.DataFrame(self.cash_flows)
-        
-        # Create financial metrics DataFrame
-        metrics_df = pd.DataFrame([self.financial_metrics])
+        cf_df = self.cash_flow_projection.to_frame()
         
         # Create summary DataFrame
         summary_data = {
@@ -386,15 +829,32 @@ class FinancialModel:
         # Generate filename if not provided
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"financial_analysis_{self.project_params.project_name}_{timestamp}.xlsx"
-        
-        # Export to Excel with multiple sheets
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
-            cf_df.to_excel(writer, sheet_name='Cash_Flows', index=False)
-            metrics_df.to_excel(writer, sheet_name='Financial_Metrics', index=False)
-        
-        logger.info(f"Financial analysis exported to {filename}")
+            filename = f"financial_analysis_{self.project_params.project_name}_{timestamp}.{format}"
+        
+        if format == 'csv':
+            # Plain CSV files (no Excel engine) for batch scripts
+            stem = os.path.splitext(filename)[0]
+            filename = f"{stem}_summary.csv"
+            summary_df.to_csv(filename, index=False)
+            cf_df.to_csv(f"{stem}_cash_flows.csv", index=False)
+            with open(f"{stem}_financial_metrics.json", 'w') as f:
+                json.dump(self.financial_metrics, f, indent=2)
+        else:
+            # Export to Excel with multiple sheets; xlsxwriter is much faster than openpyxl when installed
+            engine = 'xlsxwriter' if xlsxwriter is not None else 'openpyxl'
+            with pd.ExcelWriter(filename, engine=engine) as writer:
+                summary_df.to_excel(writer, sheet_name='Summary', index=False)
+                cf_df.to_excel(writer, sheet_name='Cash_Flows', index=False)
+                if engine == 'xlsxwriter':
+                    # Single metrics row: write it directly instead of through a one-row DataFrame
+                    worksheet = writer.book.add_worksheet('Financial_Metrics')
+                    header_format = writer.book.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+                    worksheet.write_row(0, 0, list(self.financial_metrics.keys()), header_format)
+                    worksheet.write_row(1, 0, list(self.financial_metrics.values()))
+                else:
+                    pd.DataFrame([self.financial_metrics]).to_excel(writer, sheet_name='Financial_Metrics', index=False)
+        
+        logger.info("Financial analysis exported to %s", filename)
         return filename
 
 # Example usage and testing
@@ -7,18 +7,101 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Any
 import logging
+import os
+import collections
+import functools
+import time
 from datetime import datetime
 import json
 
 # Import our modules
-from site_screening import SiteScreeningEngine, SiteMetrics
+from site_screening import SiteScreeningEngine, SiteMetrics, CATEGORICAL_FIELDS
 from financial_modeling import FinancialModel, ProjectParameters, CostStructure
 from eu_policy_engine import EUPolicyEngine
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sample European industrial sites shipped with the backend (one row per SiteMetrics record)
+_SAMPLE_SITES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sample_sites.csv')
+
+def _site_financial_model(site: SiteMetrics, target_capacity: float) -> FinancialModel:
+    """Build the FOAK financial model for one screened site and calculate its metrics"""
+    project_params = ProjectParameters(
+        project_name=f"Turnover Labs FOAK - {site.name}",
+        site_name=site.name,
+        co2_input_tpy=target_capacity,
+        co_output_tpy=target_capacity * 0.5,  # Assume 50% conversion efficiency
+        project_lifetime_years=20
+    )
+    
+    financial_model = FinancialModel(project_params)
+    
+    # Calculate CAPEX, OPEX and revenue (example values; equipment cost scales with capacity)
+    financial_model.compute(
+        equipment_cost=2000000 * (target_capacity / 100),
+        power_price_eur_mwh=site.power_price_eur_mwh,
+        power_consumption_mwh_per_ton_co=2.5,
+        water_consumption_m3_per_ton_co=5,
+        water_price_eur_m3=2,
+        labor_hours_per_ton_co=10,
+        labor_rate_eur_per_hour=site.labor_costs,
+        co_price_eur_per_ton=800
+    )
+    
+    # Generate financial metrics
+    financial_model.calculate_financial_metrics()
+    return financial_model
+
+@functools.lru_cache(maxsize=1)
+def _read_sample_sites() -> pd.DataFrame:
+    """Parse the sample sites file once per process (callers must not modify the frame)"""
+    return pd.read_csv(
+        _SAMPLE_SITES_PATH,
+        dtype={'site_id': str, **{column: 'category' for column in CATEGORICAL_FIELDS}}
+    )
+
+# Most site financial models kept across analysis runs (least recently used are evicted)
+_FIN_CACHE_SIZE = 128
+
+# Overall risk by screening score: below 60 High, 60-80 Medium, 80 and above Low
+_RISK_BINS = np.array([60.0, 80.0])
+_RISK_LABELS = np.array(['High', 'Medium', 'Low'], dtype=object)
+
+def _risk_level(total_scores: np.ndarray) -> np.ndarray:
+    """Overall risk label for each screening score"""
+    return _RISK_LABELS[np.digitize(total_scores, _RISK_BINS)]
+
+# Metrics compared by what-if impact analysis, in _impact_kernel row order
+_IMPACT_METRICS = ('npv_eur', 'irr_percent', 'payback_period_years', 'annual_roi_percent')
+
+def _impact_kernel(base: np.ndarray, modified: np.ndarray) -> np.ndarray:
+    """Percent and absolute change per metric as an (n, 2) array; NaN where the base value is zero"""
+    impact = np.empty((base.shape[0], 2))
+    for i in range(base.shape[0]):
+        delta = modified[i] - base[i]
+        if base[i] != 0:
+            impact[i, 0] = (delta / base[i]) * 100
+            impact[i, 1] = delta
+        else:
+            impact[i, 0] = np.nan
+            impact[i, 1] = np.nan
+    return impact
+
+if njit is not None:
+    _impact_kernel = njit('float64[:,:](float64[:], float64[:])', cache=True)(_impact_kernel)
+
 class CarbonSiteAIEngine:
     """Main orchestrator for CarbonSiteAI backend operations"""
     
@@ -26,168 +109,44 @@ class CarbonSiteAIEngine:
         self.site_engine = SiteScreeningEngine()
         self.policy_engine = EUPolicyEngine()
         self.financial_models = {}
+        self._fin_cache = collections.OrderedDict()  # LRU of site financial models by _site_financial_model inputs
         self.analysis_results = {}
+        self._site_index = {}
         
         logger.info("CarbonSiteAI Engine initialized")
     
+    @staticmethod
+    def warmup() -> None:
+        """Compile the numba kernels before an interactive session so the first analysis pays no JIT cost"""
+        
+        if njit is None:
+            return
+        
+        # _impact_kernel is compiled at import from its signature; the financial kernels compile on
+        # first call (or load from the on-disk cache), so run one small model through them
+        project_params = ProjectParameters(
+            project_name="Warm-up",
+            site_name="Warm-up",
+            co2_input_tpy=100,
+            co_output_tpy=50
+        )
+        FinancialModel(project_params).analyze(
+            use_cache=False,
+            equipment_cost=2000000,
+            power_price_eur_mwh=75,
+            power_consumption_mwh_per_ton_co=2.5,
+            water_consumption_m3_per_ton_co=5,
+            water_price_eur_m3=2,
+            labor_hours_per_ton_co=10,
+            labor_rate_eur_per_hour=35,
+            co_price_eur_per_ton=800
+        )
+    
     def load_sample_data(self) -> None:
         """Load sample European industrial sites for demonstration"""
         
-        sample_sites = [
-            {
-                'site_id': 'DE001',
-                'name': 'BASF Ludwigshafen',
-                'country': 'DE',
-                'region': 'Rhineland-Palatinate',
-                'latitude': 49.4811,
-                'longitude': 8.4353,
-                'co2_volume_tpy': 3200000,
-                'co2_concentration': 85,
-                'co2_impurities': 'Low',
-                'co2_availability_score': 0,
-                'power_price_eur_mwh': 75,
-                'power_availability': 99.5,
-                'renewable_energy_share': 25,
-                'energy_score': 0,
-                'emissions_intensity': 450,
-                'eu_ets_price': 85,
-                'cbam_applicable': True,
-                'policy_score': 0,
-                'industrial_zone': 'Chemical',
-                'utility_availability': 'Excellent',
-                'transport_access': 'Excellent',
-                'infrastructure_score': 0,
-                'labor_costs': 35,
-                'land_costs': 200,
-                'tax_incentives': 15,
-                'financial_score': 0,
-                'total_score': 0,
-                'ranking': 0
-            },
-            {
-                'site_id': 'NL001',
-                'name': 'Shell Pernis Refinery',
-                'country': 'NL',
-                'region': 'South Holland',
-                'latitude': 51.9225,
-                'longitude': 4.4792,
-                'co2_volume_tpy': 2800000,
-                'co2_concentration': 90,
-                'co2_impurities': 'Medium',
-                'co2_availability_score': 0,
-                'power_price_eur_mwh': 82,
-                'power_availability': 99.8,
-                'renewable_energy_share': 30,
-                'energy_score': 0,
-                'emissions_intensity': 520,
-                'eu_ets_price': 88,
-                'cbam_applicable': True,
-                'policy_score': 0,
-                'industrial_zone': 'Refinery',
-                'utility_availability': 'Excellent',
-                'transport_access': 'Excellent',
-                'infrastructure_score': 0,
-                'labor_costs': 38,
-                'land_costs': 250,
-                'tax_incentives': 20,
-                'financial_score': 0,
-                'total_score': 0,
-                'ranking': 0
-            },
-            {
-                'site_id': 'BE001',
-                'name': 'Total Antwerp',
-                'country': 'BE',
-                'region': 'Antwerp',
-                'latitude': 51.2194,
-                'longitude': 4.4025,
-                'co2_volume_tpy': 2100000,
-                'co2_concentration': 88,
-                'co2_impurities': 'Low',
-                'co2_availability_score': 0,
-                'power_price_eur_mwh': 78,
-                'power_availability': 99.2,
-                'renewable_energy_share': 22,
-                'energy_score': 0,
-                'emissions_intensity': 480,
-                'eu_ets_price': 87,
-                'cbam_applicable': True,
-                'policy_score': 0,
-                'industrial_zone': 'Refinery',
-                'utility_availability': 'Excellent',
-                'transport_access': 'Excellent',
-                'infrastructure_score': 0,
-                'labor_costs': 36,
-                'land_costs': 220,
-                'tax_incentives': 18,
-                'financial_score': 0,
-                'total_score': 0,
-                'ranking': 0
-            },
-            {
-                'site_id': 'FR001',
-                'name': 'ExxonMobil Le Havre',
-                'country': 'FR',
-                'region': 'Normandy',
-                'latitude': 49.4944,
-                'longitude': 0.1079,
-                'co2_volume_tpy': 1800000,
-                'co2_concentration': 82,
-                'co2_impurities': 'Medium',
-                'co2_availability_score': 0,
-                'power_price_eur_mwh': 68,
-                'power_availability': 98.8,
-                'renewable_energy_share': 35,
-                'energy_score': 0,
-                'emissions_intensity': 380,
-                'eu_ets_price': 86,
-                'cbam_applicable': True,
-                'policy_score': 0,
-                'industrial_zone': 'Refinery',
-                'utility_availability': 'Good',
-                'transport_access': 'Good',
-                'infrastructure_score': 0,
-                'labor_costs': 32,
-                'land_costs': 180,
-                'tax_incentives': 12,
-                'financial_score': 0,
-                'total_score': 0,
-                'ranking': 0
-            },
-            {
-                'site_id': 'IT001',
-                'name': 'Eni Porto Marghera',
-                'country': 'IT',
-                'region': 'Veneto',
-                'latitude': 45.4371,
-                'longitude': 12.3326,
-                'co2_volume_tpy': 1500000,
-                'co2_concentration': 80,
-                'co2_impurities': 'High',
-                'co2_availability_score': 0,
-                'power_price_eur_mwh': 95,
-                'power_availability': 98.5,
-                'renewable_energy_share': 28,
-                'energy_score': 0,
-                'emissions_intensity': 550,
-                'eu_ets_price': 84,
-                'cbam_applicable': True,
-                'policy_score': 0,
-                'industrial_zone': 'Refinery',
-                'utility_availability': 'Good',
-                'transport_access': 'Good',
-                'infrastructure_score': 0,
-                'labor_costs': 28,
-                'land_costs': 150,
-                'tax_incentives': 10,
-                'financial_score': 0,
-                'total_score': 0,
-                'ranking': 0
-            }
-        ]
-        
-        for site_data in sample_sites:
-            self.site_engine.add_site(site_data)
+        sample_sites = _read_sample_sites()
+        self.site_engine.add_sites_frame(sample_sites)
         
         logger.info(f"Loaded {len(sample_sites)} sample European sites")
     
@@ -214,76 +173,75 @@ class CarbonSiteAIEngine:
         
         # Run site screening
         logger.info("Running site screening analysis...")
-        screened_sites = self.site_engine.evaluate_sites()
-        top_sites = self.site_engine.get_top_sites(5)
+        order = self.site_engine.rank_sites()
+        top_indices = order[:5]
+        
+        # Only the top sites are materialized as SiteMetrics (for the financial models and risk checks)
+        top_sites = [self.site_engine.row(index) for index in top_indices]
+        columns = self.site_engine.columns
         
         # Initialize results storage
+        analysis_time_ns = time.time_ns()
         analysis_results = {
             'project_type': project_type,
             'target_capacity': target_capacity,
             'priority_weights': priority_weights,
-            'analysis_timestamp': datetime.now().isoformat(),
+            'analysis_timestamp': datetime.fromtimestamp(analysis_time_ns / 1e9).isoformat(),
+            'analysis_timestamp_ns': analysis_time_ns,
             'top_sites': [],
             'financial_analysis': {},
             'policy_analysis': {},
             'recommendations': []
         }
         
+        # Run EU policy analysis for all top sites in one portfolio call
+        policy_analyses = self.policy_engine.generate_policy_analysis_portfolio(
+            [
+                {
+                    'name': name,
+                    'country': country,
+                    'region': region
+                }
+                for name, country, region in zip(
+                    columns['name'][top_indices].tolist(),
+                    columns['country'][top_indices].tolist(),
+                    columns['region'][top_indices].tolist()
+                )
+            ],
+            [
+                {
+                    'co2_reduction_tpy': target_capacity,
+                    'product_type': 'chemicals',
+                    'carbon_intensity': 500,
+                    'renewable_energy_share': renewable_energy_share,
+                    'energy_efficiency_score': 70,
+                    'project_lifetime_years': 20
+                }
+                for renewable_energy_share in columns['renewable_energy_share'][top_indices].tolist()
+            ]
+        )
+        
+        # Build the per-site financial models that are not cached from an earlier run
+        model_keys = [(site.name, target_capacity, site.power_price_eur_mwh, site.labor_costs) for site in top_sites]
+        site_models = []
+        for site, key in zip(top_sites, model_keys):
+            financial_model = self._fin_cache.get(key)
+            if financial_model is None:
+                financial_model = _site_financial_model(site, target_capacity)
+                self._fin_cache[key] = financial_model
+            self._fin_cache.move_to_end(key)
+            site_models.append(financial_model)
+        while len(self._fin_cache) > _FIN_CACHE_SIZE:
+            self._fin_cache.popitem(last=False)
+        
+        overall_risks = _risk_level(columns['total_score'][top_indices]).tolist()
+        
         # Analyze top sites
-        for i, site in enumerate(top_sites):
+        site_ids = []
+        for i, (site, financial_model, policy_analysis, overall_risk) in enumerate(
+                zip(top_sites, site_models, policy_analyses, overall_risks)):
             logger.info(f"Analyzing site {i+1}: {site.name}")
-            
-            # Create financial model
-            project_params = ProjectParameters(
-                project_name=f"Turnover Labs FOAK - {site.name}",
-                site_name=site.name,
-                co2_input_tpy=target_capacity,
-                co_output_tpy=target_capacity * 0.5,  # Assume 50% conversion efficiency
-                project_lifetime_years=20
-            )
-            
-            financial_model = FinancialModel(project_params)
-            
-            # Calculate costs (example values)
-            cost_structure = financial_model.calculate_capex(
-                equipment_cost=2000000 * (target_capacity / 100)  # Scale with capacity
-            )
-            
-            # Calculate OPEX
-            financial_model.calculate_opex(
-                power_price_eur_mwh=site.power_price_eur_mwh,
-                power_consumption_mwh_per_ton_co=2.5,
-                water_consumption_m3_per_ton_co=5,
-                water_price_eur_m3=2,
-                labor_hours_per_ton_co=10,
-                labor_rate_eur_per_hour=site.labor_costs
-            )
-            
-            # Calculate revenue
-            financial_model.calculate_revenue(co_price_eur_per_ton=800)
-            
-            # Generate financial metrics
-            financial_metrics = financial_model.calculate_financial_metrics()
-            
-            # Run EU policy analysis
-            site_data = {
-                'name': site.name,
-                'country': site.country,
-                'region': site.region
-            }
-            
-            project_data = {
-                'co2_reduction_tpy': target_capacity,
-                'product_type': 'chemicals',
-                'carbon_intensity': 500,
-                'renewable_energy_share': site.renewable_energy_share,
-                'energy_efficiency_score': 70,
-                'project_lifetime_years': 20
-            }
-            
-            policy_analysis = self.policy_engine.generate_comprehensive_policy_analysis(
-                site_data, project_data
-            )
+            financial_metrics = dict(financial_model.financial_metrics)
             
             # Compile site analysis
             site_analysis = {
@@ -305,7 +263,7 @@ class CarbonSiteAIEngine:
                 'financial_analysis': financial_metrics,
                 'policy_analysis': policy_analysis,
                 'risk_assessment': {
-                    'overall_risk': 'Low' if site.total_score >= 80 else 'Medium' if site.total_score >= 60 else 'High',
+                    'overall_risk': overall_risk,
                     'key_risks': self._identify_key_risks(site, financial_metrics, policy_analysis),
                     'mitigation_strategies': self._generate_mitigation_strategies(site, financial_metrics, policy_analysis)
                 }
@@ -315,6 +273,7 @@ class CarbonSiteAIEngine:
             
             # Store financial model for later use
             self.financial_models[site.site_id] = financial_model
+            site_ids.append(site.site_id)
         
         # Generate overall recommendations
         analysis_results['recommendations'] = self._generate_overall_recommendations(
@@ -324,6 +283,13 @@ class CarbonSiteAIEngine:
         # Store results
         self.analysis_results = analysis_results
         
+        # Index the analysed sites by display name and by site ID (first match wins, as in a scan)
+        self._site_index = {}
+        for site_analysis in analysis_results['top_sites']:
+            self._site_index.setdefault(site_analysis['site_info']['name'], site_analysis)
+        for site_id, site_analysis in zip(site_ids, analysis_results['top_sites']):
+            self._site_index.setdefault(site_id, site_analysis)
+        
         logger.info("Comprehensive analysis complete")
         return analysis_results
     
@@ -427,73 +393,87 @@ class CarbonSiteAIEngine:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"carbonsiteai_analysis_report_{timestamp}.xlsx"
         
+        top_sites = self.analysis_results['top_sites']
+        
+        # Each sheet is a header plus rows, already in ranking order
+        sheets = {}
+        
         # Create summary sheet
-        summary_data = {
-            'Project Type': [self.analysis_results['project_type']],
-            'Target Capacity (TPY)': [self.analysis_results['target_capacity']],
-            'Analysis Date': [self.analysis_results['analysis_timestamp']],
-            'Top Site': [self.analysis_results['top_sites'][0]['site_info']['name'] if self.analysis_results['top_sites'] else 'N/A'],
-            'Top Site Score': [f"{self.analysis_results['top_sites'][0]['screening_scores']['total_score']:.1f}/100" if self.analysis_results['top_sites'] else 'N/A']
+        summary_row = {
+            'Project Type': self.analysis_results['project_type'],
+            'Target Capacity (TPY)': self.analysis_results['target_capacity'],
+            'Analysis Date': self.analysis_results['analysis_timestamp'],
+            'Top Site': top_sites[0]['site_info']['name'] if top_sites else 'N/A',
+            'Top Site Score': f"{top_sites[0]['screening_scores']['total_score']:.1f}/100" if top_sites else 'N/A'
         }
-        summary_df = pd.DataFrame(summary_data)
+        sheets['Summary'] = (list(summary_row), [list(summary_row.values())])
+        
+        # Create site comparison sheet (built column by column)
+        screening_scores = [site['screening_scores'] for site in top_sites]
+        financial_analyses = [site['financial_analysis'] for site in top_sites]
+        site_comparison_columns = {
+            'Ranking': [site['ranking'] for site in top_sites],
+            'Site Name': [site['site_info']['name'] for site in top_sites],
+            'Country': [site['site_info']['country'] for site in top_sites],
+            'Total Score': [scores['total_score'] for scores in screening_scores],
+            'CO2 Score': [scores['co2_availability'] for scores in screening_scores],
+            'Energy Score': [scores['energy'] for scores in screening_scores],
+            'Policy Score': [scores['policy'] for scores in screening_scores],
+            'Infrastructure Score': [scores['infrastructure'] for scores in screening_scores],
+            'Financial Score': [scores['financial'] for scores in screening_scores],
+            'NPV (€)': [metrics.get('npv_eur', 0) for metrics in financial_analyses],
+            'IRR (%)': [metrics.get('irr_percent', 0) for metrics in financial_analyses],
+            'Payback (years)': [metrics.get('payback_period_years', 0) for metrics in financial_analyses],
+            'Policy Risk': [site['risk_assessment']['overall_risk'] for site in top_sites]
+        }
+        sheets['Site_Comparison'] = (
+            list(site_comparison_columns) if top_sites else [],
+            [list(row) for row in zip(*site_comparison_columns.values())]
+        )
         
-        # Create site comparison sheet
-        site_comparison_data = []
-        for site in self.analysis_results['top_sites']:
-            site_comparison_data.append({
-                'Ranking': site['ranking'],
+        # Create recommendations sheet
+        sheets['Recommendations'] = (
+            ['Recommendation'],
+            [[recommendation] for recommendation in self.analysis_results['recommendations']]
+        )
+        
+        # Add detailed site sheets
+        for i, site in enumerate(top_sites):
+            site_details = {
+                'Metric': 'Value',
                 'Site Name': site['site_info']['name'],
                 'Country': site['site_info']['country'],
                 'Total Score': site['screening_scores']['total_score'],
-                'CO2 Score': site['screening_scores']['co2_availability'],
-                'Energy Score': site['screening_scores']['energy'],
-                'Policy Score': site['screening_scores']['policy'],
-                'Infrastructure Score': site['screening_scores']['infrastructure'],
-                'Financial Score': site['screening_scores']['financial'],
-                'NPV (€)': site['financial_analysis'].get('npv_eur', 0),
-                'IRR (%)': site['financial_analysis'].get('irr_percent', 0),
-                'Payback (years)': site['financial_analysis'].get('payback_period_years', 0),
-                'Policy Risk': site['risk_assessment']['overall_risk']
-            })
-        site_comparison_df = pd.DataFrame(site_comparison_data)
-        
-        # Create recommendations sheet
-        recommendations_df = pd.DataFrame({
-            'Recommendation': self.analysis_results['recommendations']
-        })
+                'Financial NPV': f"€{site['financial_analysis'].get('npv_eur', 0):,.0f}",
+                'Policy Score': f"{site['policy_analysis'].get('overall_policy_score', 0):.1f}/100"
+            }
+            sheets[f'Site_{i+1}_{site["site_info"]["name"][:20]}'] = (list(site_details), [list(site_details.values())])
         
         # Export to Excel
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
-            site_comparison_df.to_excel(writer, sheet_name='Site_Comparison', index=False)
-            recommendations_df.to_excel(writer, sheet_name='Recommendations', index=False)
-            
-            # Add detailed site sheets
-            for i, site in enumerate(self.analysis_results['top_sites']):
-                sheet_name = f'Site_{i+1}_{site["site_info"]["name"][:20]}'
-                
-                # Site details
-                site_details = pd.DataFrame([{
-                    'Metric': 'Value',
-                    'Site Name': site['site_info']['name'],
-                    'Country': site['site_info']['country'],
-                    'Total Score': site['screening_scores']['total_score'],
-                    'Financial NPV': f"€{site['financial_analysis'].get('npv_eur', 0):,.0f}",
-                    'Policy Score': f"{site['policy_analysis'].get('overall_policy_score', 0):.1f}/100"
-                }])
-                site_details.to_excel(writer, sheet_name=sheet_name, index=False)
+        if xlsxwriter is not None:
+            # Stream rows to disk as they are written (constant_memory needs row-by-row order,
+            # which DataFrame.to_excel does not guarantee, so rows are written directly)
+            workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
+            header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+            for sheet_name, (columns, rows) in sheets.items():
+                worksheet = workbook.add_worksheet(sheet_name)
+                if columns:
+                    worksheet.write_row(0, 0, columns, header_format)
+                for row_index, row in enumerate(rows, 1):
+                    worksheet.write_row(row_index, 0, row)
+            workbook.close()
+        else:
+            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+                for sheet_name, (columns, rows) in sheets.items():
+                    pd.DataFrame(rows, columns=columns).to_excel(writer, sheet_name=sheet_name, index=False)
         
         logger.info(f"Analysis report exported to {filename}")
         return filename
     
     def get_site_details(self, site_id: str) -> Optional[Dict]:
-        """Get detailed information for a specific site"""
+        """Get detailed information for a specific site (by name or site ID)"""
         
-        for site in self.analysis_results.get('top_sites', []):
-            if site['site_info']['name'] == site_id:
-                return site
-        
-        return None
+        return self._site_index.get(site_id)
     
     def run_what_if_analysis(self, 
                              base_site: str,
@@ -519,9 +499,9 @@ class CarbonSiteAIEngine:
         # Run financial analysis with modified parameters
         financial_model = FinancialModel(modified_params)
         
-        # Apply parameter changes
+        # Apply parameter changes (calculate_capex returns the cost structure; OPEX and revenue build on it)
         if 'equipment_cost' in parameter_changes:
-            financial_model.calculate_capex(parameter_changes['equipment_cost'])
+            financial_model.cost_structure = financial_model.calculate_capex(parameter_changes['equipment_cost'])
         
         if 'power_price' in parameter_changes:
             financial_model.calculate_opex(
@@ -555,18 +535,19 @@ class CarbonSiteAIEngine:
                                    modified_metrics: Dict) -> Dict[str, Any]:
         """Calculate impact of parameter changes"""
         
-        impact = {}
+        # Only metrics present and numeric on both sides are compared
+        keys = [
+            key for key in _IMPACT_METRICS
+            if isinstance(base_metrics.get(key), (int, float)) and isinstance(modified_metrics.get(key), (int, float))
+        ]
+        base = np.fromiter((base_metrics[key] for key in keys), dtype=np.float64, count=len(keys))
+        modified = np.fromiter((modified_metrics[key] for key in keys), dtype=np.float64, count=len(keys))
         
-        for key in ['npv_eur', 'irr_percent', 'payback_period_years', 'annual_roi_percent']:
-            if key in base_metrics and key in modified_metrics:
-                base_value = base_metrics[key]
-                modified_value = modified_metrics[key]
-                
-                if isinstance(base_value, (int, float)) and isinstance(modified_value, (int, float)):
-                    if base_value != 0:
-                        change_percent = ((modified_value - base_value) / base_value) * 100
-                        impact[f'{key}_change_percent'] = change_percent
-                        impact[f'{key}_change_absolute'] = modified_value - base_value
+        impact = {}
+        for key, is_nonzero, (change_percent, change_absolute) in zip(keys, (base != 0).tolist(), _impact_kernel(base, modified).tolist()):
+            if is_nonzero:
+                impact[f'{key}_change_percent'] = change_percent
+                impact[f'{key}_change_absolute'] = change_absolute
         
         return impact
 
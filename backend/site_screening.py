@@ -5,14 +5,42 @@ Evaluates potential sites based on CO₂ availability, power prices, emissions i
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Tuple, Optional
+from types import MappingProxyType
+from dataclasses import dataclass, fields
+from pandas.api.types import union_categoricals
 import logging
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sub-score order of score_columns' score matrix (matches the weights keys)
+SCORE_COMPONENTS = ('co2_availability', 'energy', 'policy', 'infrastructure', 'financial')
+
+# Industrial zone scoring (0-40 points)
+_ZONE_SCORES = {
+    'Chemical': 40,
+    'Refinery': 35,
+    'Steel': 30,
+    'Cement': 25,
+    'Power': 20,
+    'Other': 15
+}
+
+# Utility availability and transport access scoring (0-30 points each)
+_ACCESS_SCORES = {
+    'Excellent': 30,
+    'Good': 25,
+    'Fair': 20,
+    'Poor': 10
+}
+
 @dataclass
 class SiteMetrics:
     """Comprehensive site evaluation metrics"""
@@ -57,11 +85,183 @@ class SiteMetrics:
     total_score: float  # 0-100
     ranking: int
 
+# SiteMetrics field names, i.e. the columns of the screening store
+_SITE_FIELDS = tuple(field.name for field in fields(SiteMetrics))
+_SITE_FIELD_SET = frozenset(_SITE_FIELDS)
+
+# Low-cardinality text fields, stored as pd.Categorical (integer codes plus one copy of each value)
+CATEGORICAL_FIELDS = ('country', 'region', 'co2_impurities', 'industrial_zone', 'utility_availability', 'transport_access')
+
+# Store column -> CSV header for export_results, in output order
+_EXPORT_COLUMNS = {
+    'ranking': 'Ranking',
+    'name': 'Name',
+    'country': 'Country',
+    'total_score': 'Total_Score',
+    'co2_availability_score': 'CO2_Score',
+    'energy_score': 'Energy_Score',
+    'policy_score': 'Policy_Score',
+    'infrastructure_score': 'Infrastructure_Score',
+    'financial_score': 'Financial_Score',
+    'co2_volume_tpy': 'CO2_Volume_TPY',
+    'power_price_eur_mwh': 'Power_Price_EUR_MWh',
+    'eu_ets_price': 'EU_ETS_Price',
+    'emissions_intensity': 'Emissions_Intensity'
+}
+
+def _frame_columns(sites_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Store columns for a DataFrame of sites: categorical text fields, boolean CBAM flag, others as-is"""
+    columns = {}
+    for name in _SITE_FIELDS:
+        if name in CATEGORICAL_FIELDS:
+            columns[name] = pd.Categorical(sites_df[name])
+        elif name == 'cbam_applicable':
+            columns[name] = sites_df[name].to_numpy(dtype=bool)
+        else:
+            columns[name] = sites_df[name].to_numpy()
+    return columns
+
+def _as_float(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+def _co2_availability_scores(co2_volume_tpy, co2_concentration) -> np.ndarray:
+    """CO₂ availability score (0-100) per site"""
+    # Volume scoring (0-50 points): 1000 TPY = 50 points
+    volume_score = np.minimum(50, (_as_float(co2_volume_tpy) / 1000) * 50)
+    
+    # Concentration scoring (0-30 points)
+    # Higher concentration = better (20% = 0 points, 100% = 30 points)
+    concentration_score = ((_as_float(co2_concentration) - 20) / 80) * 30
+    
+    # Impurity tolerance (0-20 points)
+    # Assume lower impurities = higher score
+    impurity_score = 20  # Placeholder - would need impurity analysis
+    
+    return np.clip(volume_score + concentration_score + impurity_score, 0, 100)
+
+def _energy_scores(power_price_eur_mwh, renewable_energy_share, power_availability) -> np.ndarray:
+    """Energy cost and availability score (0-100) per site"""
+    # Power price scoring (0-50 points)
+    # Lower price = higher score: €50/MWh = 50 points, €150/MWh = 0 points
+    price_score = np.clip(50 - ((_as_float(power_price_eur_mwh) - 50) / 100) * 50, 0, 50)
+    
+    # Renewable energy scoring (0-30 points)
+    renewable_score = _as_float(renewable_energy_share) * 0.3
+    
+    # Availability scoring (0-20 points)
+    availability_score = _as_float(power_availability) * 0.2
+    
+    return np.clip(price_score + renewable_score + availability_score, 0, 100)
+
+def _policy_scores(eu_ets_price, cbam_applicable, emissions_intensity) -> np.ndarray:
+    """EU policy alignment score (0-100) per site"""
+    # EU ETS price scoring (0-40 points)
+    # Higher ETS price = better for CO₂ reduction projects (€40 = 0 points, €80 = 40 points)
+    ets_score = np.clip(((_as_float(eu_ets_price) - 40) / 40) * 40, 0, 40)
+    
+    # CBAM applicability (0-30 points)
+    cbam_score = np.asarray(cbam_applicable, dtype=bool) * 30.0
+    
+    # Emissions intensity scoring (0-30 points)
+    # Lower intensity = better (200 = 30 points, 800 = 0 points)
+    intensity_score = np.clip(30 - ((_as_float(emissions_intensity) - 200) / 600) * 30, 0, 30)
+    
+    return np.clip(ets_score + cbam_score + intensity_score, 0, 100)
+
+def _infrastructure_scores(industrial_zone, utility_availability, transport_access) -> np.ndarray:
+    """Infrastructure availability score (0-100, whole points) per site; unknown categories score 15"""
+    def lookup(values, scores):
+        # One dict lookup per category, then a gather by category code; code -1 (missing)
+        # picks the trailing default. Points are small integers, so the gathered arrays are int16
+        categorical = values if isinstance(values, pd.Categorical) else pd.Categorical(values)
+        table = np.array([scores.get(category, 15) for category in categorical.categories] + [15], dtype=np.int16)
+        return table[categorical.codes]
+    
+    # Industrial zone (0-40 points), utility availability and transport access (0-30 points each)
+    zone_score = lookup(industrial_zone, _ZONE_SCORES)
+    utility_score = lookup(utility_availability, _ACCESS_SCORES)
+    transport_score = lookup(transport_access, _ACCESS_SCORES)
+    
+    # Summed exactly in int16; the score stays an integer (it is widened where the weighted total is formed)
+    return np.clip(zone_score + utility_score + transport_score, 0, 100).astype(np.int64)
+
+def _financial_scores(labor_costs, land_costs, tax_incentives) -> np.ndarray:
+    """Financial viability score (0-100) per site"""
+    # Labor cost scoring (0-40 points)
+    # Lower labor costs = higher score (€25/hour = 40 points, €50/hour = 0 points)
+    labor_score = np.clip(40 - ((_as_float(labor_costs) - 25) / 25) * 40, 0, 40)
+    
+    # Land cost scoring (0-30 points): €100/m² = 30 points, €500/m² = 0 points
+    land_score = np.clip(30 - ((_as_float(land_costs) - 100) / 400) * 30, 0, 30)
+    
+    # Tax incentives (0-30 points)
+    incentive_score = np.minimum(30, _as_float(tax_incentives) * 0.3)
+    
+    return np.clip(labor_score + land_score + incentive_score, 0, 100)
+
+def _score_kernel(co2_volume_tpy, co2_concentration,
+                  power_price_eur_mwh, renewable_energy_share, power_availability,
+                  eu_ets_price, cbam_applicable, emissions_intensity,
+                  infrastructure_score, labor_costs, land_costs, tax_incentives, weights):
+    """All five score formulas and the weighted total in one pass per site (compiled when numba is installed)
+    
+    Same arithmetic as the _*_scores functions, with np.clip written as min(max(...)); the
+    infrastructure scores come in precomputed because their lookups are on text categories.
+    """
+    n_sites = co2_volume_tpy.shape[0]
+    scores = np.empty((n_sites, 5))
+    totals = np.empty(n_sites)
+    for i in range(n_sites):
+        co2 = (min(50.0, (co2_volume_tpy[i] / 1000) * 50) +
+               ((co2_concentration[i] - 20) / 80) * 30 + 20)
+        energy = (min(max(50 - ((power_price_eur_mwh[i] - 50) / 100) * 50, 0.0), 50.0) +
+                  renewable_energy_share[i] * 0.3 + power_availability[i] * 0.2)
+        policy = (min(max(((eu_ets_price[i] - 40) / 40) * 40, 0.0), 40.0) +
+                  cbam_applicable[i] * 30.0 +
+                  min(max(30 - ((emissions_intensity[i] - 200) / 600) * 30, 0.0), 30.0))
+        financial = (min(max(40 - ((labor_costs[i] - 25) / 25) * 40, 0.0), 40.0) +
+                     min(max(30 - ((land_costs[i] - 100) / 400) * 30, 0.0), 30.0) +
+                     min(30.0, tax_incentives[i] * 0.3))
+        scores[i, 0] = min(max(co2, 0.0), 100.0)
+        scores[i, 1] = min(max(energy, 0.0), 100.0)
+        scores[i, 2] = min(max(policy, 0.0), 100.0)
+        scores[i, 3] = infrastructure_score[i]
+        scores[i, 4] = min(max(financial, 0.0), 100.0)
+        
+        # Weighted total, accumulated in component order
+        total = scores[i, 0] * weights[0]
+        for component in range(1, 5):
+            total += scores[i, component] * weights[component]
+        totals[i] = total
+    return scores, totals
+
+if njit is not None:
+    # Eager compilation from an explicit signature, persisted with cache=True
+    _score_kernel = njit(
+        'Tuple((float64[:, :], float64[:]))(' +
+        ', '.join(['float64[:]'] * 6 + ['boolean[:]'] + ['float64[:]'] * 6) + ')',
+        cache=True
+    )(_score_kernel)
+
+def _concat_column(existing, new):
+    """Concatenate two store columns, keeping categorical columns categorical"""
+    if isinstance(existing, pd.Categorical):
+        return union_categoricals([existing, new], ignore_order=True)
+    return np.concatenate([existing, new])
+
 class SiteScreeningEngine:
     """Main engine for screening and ranking potential sites"""
     
     def __init__(self):
-        self.sites = []
+        # Sites are stored column-wise (one array per SiteMetrics field, in insertion order;
+        # CATEGORICAL_FIELDS as pd.Categorical); added rows are staged and appended to the
+        # columns in one go when next needed
+        self.columns: Dict[str, np.ndarray] = {}
+        self._pending_sites: List[Dict] = []
+        self._order: Optional[np.ndarray] = None  # site indices by ranking, set by rank_sites
+        self._dirty = True  # sites or weights changed since the last rank_sites
+        self._top: Optional[np.ndarray] = None  # partial ranking from get_top_sites while dirty
+        self._rows: Dict[int, SiteMetrics] = {}  # materialized rows, valid until the next rank_sites
         self.weights = {
             'co2_availability': 0.25,
             'energy': 0.20,
@@ -69,174 +269,247 @@ class SiteScreeningEngine:
             'infrastructure': 0.15,
             'financial': 0.20
         }
+    
+    @property
+    def weights(self) -> Mapping[str, float]:
+        """Score weights per component (read-only); assign a new dict to change them"""
+        return MappingProxyType(self._weights)
+    
+    @weights.setter
+    def weights(self, weights: Dict[str, float]) -> None:
+        # Copied so later changes to the caller's dict cannot bypass the stale-ranking flag
+        self._weights = dict(weights)
+        self._invalidate()
         
     def add_site(self, site_data: Dict) -> None:
         """Add a new site to the screening database"""
-        try:
-            site = SiteMetrics(**site_data)
-            self.sites.append(site)
-            logger.info(f"Added site: {site.name}")
-        except Exception as e:
-            logger.error(f"Error adding site {site_data.get('name', 'Unknown')}: {e}")
+        if self._stage_sites([site_data]):
+            logger.info(f"Added site: {site_data['name']}")
+    
+    def add_sites(self, sites: Iterable[Dict]) -> int:
+        """Add many sites to the screening database at once; returns the number added"""
+        added = self._stage_sites(sites)
+        logger.info(f"Added {added} sites")
+        return added
+    
+    def _stage_sites(self, sites: Iterable[Dict]) -> int:
+        """Stage site records with exactly the SiteMetrics fields for the column store; others are logged and skipped"""
+        staged = 0
+        for site_data in sites:
+            if site_data.keys() != _SITE_FIELD_SET:
+                missing = sorted(_SITE_FIELD_SET.difference(site_data))
+                unexpected = sorted(set(site_data).difference(_SITE_FIELD_SET))
+                logger.error(
+                    f"Error adding site {site_data.get('name', 'Unknown')}: "
+                    f"missing fields {missing}, unexpected fields {unexpected}"
+                )
+                continue
+            self._pending_sites.append(site_data)
+            staged += 1
+        
+        if staged:
+            self._order = None
+            self._invalidate()
+        return staged
+    
+    def add_sites_frame(self, sites_df: pd.DataFrame) -> None:
+        """Append a DataFrame of sites (one column per SiteMetrics field) to the screening database"""
+        self._append_columns(_frame_columns(sites_df))
+        logger.info(f"Added {len(sites_df)} sites")
+    
+    def _append_columns(self, new_columns: Dict[str, np.ndarray]) -> None:
+        """Append whole columns of new sites to the store"""
+        if self.columns:
+            new_columns = {name: _concat_column(self.columns[name], new_columns[name]) for name in _SITE_FIELDS}
+        self.columns = new_columns
+        self._order = None
+        self._invalidate()
+    
+    def _invalidate(self) -> None:
+        """Mark scores and rankings stale after the sites or weights change"""
+        self._dirty = True
+        self._top = None
+    
+    def _site_columns(self) -> Dict[str, np.ndarray]:
+        """The column store with any staged sites appended"""
+        if self._pending_sites:
+            staged = pd.DataFrame.from_records(self._pending_sites, columns=list(_SITE_FIELDS))
+            self._pending_sites = []
+            self._append_columns(_frame_columns(staged))
+        return self.columns
+    
+    def __len__(self) -> int:
+        return len(self._site_columns().get('site_id', ()))
+    
+    def row(self, index: int) -> SiteMetrics:
+        """Materialize the site at store position index as a SiteMetrics (cached until the next ranking)"""
+        site = self._rows.get(index)
+        if site is None:
+            columns = self._site_columns()
+            site = SiteMetrics(**{name: columns[name][index:index + 1].tolist()[0] for name in _SITE_FIELDS})
+            self._rows[index] = site
+        return site
+    
+    @property
+    def sites(self) -> List[SiteMetrics]:
+        """All sites as SiteMetrics, in ranking order once evaluated (insertion order before)"""
+        return [self.row(index) for index in self._current_order()]
+    
+    def _current_order(self) -> np.ndarray:
+        """Store positions in ranking order, or insertion order if the sites have not been ranked"""
+        if self._top is not None:
+            # get_top_sites rescored the store but ranked only the best sites; finish the ranking
+            # so the order matches the scores
+            self.rank_sites()
+        return self._previous_order()
+    
+    def _previous_order(self) -> np.ndarray:
+        """Store positions in the last full ranking order (insertion order before any), used to break ties"""
+        if self._order is not None:
+            return self._order
+        return np.arange(len(self))
     
     def calculate_co2_score(self, site: SiteMetrics) -> float:
         """Calculate CO₂ availability score (0-100)"""
-        # Volume scoring (0-50 points)
-        volume_score = min(50, (site.co2_volume_tpy / 1000) * 50)  # 1000 TPY = 50 points
-        
-        # Concentration scoring (0-30 points)
-        # Higher concentration = better (20% = 0 points, 100% = 30 points)
-        concentration_score = ((site.co2_concentration - 20) / 80) * 30
-        
-        # Impurity tolerance (0-20 points)
-        # Assume lower impurities = higher score
-        impurity_score = 20  # Placeholder - would need impurity analysis
-        
-        total_score = volume_score + concentration_score + impurity_score
-        return min(100, max(0, total_score))
+        return float(_co2_availability_scores([site.co2_volume_tpy], [site.co2_concentration])[0])
     
     def calculate_energy_score(self, site: SiteMetrics) -> float:
         """Calculate energy cost and availability score (0-100)"""
-        # Power price scoring (0-50 points)
-        # Lower price = higher score
-        # Assume €50/MWh = 50 points, €150/MWh = 0 points
-        if site.power_price_eur_mwh <= 50:
-            price_score = 50
-        elif site.power_price_eur_mwh >= 150:
-            price_score = 0
-        else:
-            price_score = 50 - ((site.power_price_eur_mwh - 50) / 100) * 50
-        
-        # Renewable energy scoring (0-30 points)
-        renewable_score = site.renewable_energy_share * 0.3
-        
-        # Availability scoring (0-20 points)
-        availability_score = site.power_availability * 0.2
-        
-        total_score = price_score + renewable_score + availability_score
-        return min(100, max(0, total_score))
+        return float(_energy_scores(
+            [site.power_price_eur_mwh], [site.renewable_energy_share], [site.power_availability]
+        )[0])
     
     def calculate_policy_score(self, site: SiteMetrics) -> float:
         """Calculate EU policy alignment score (0-100)"""
-        # EU ETS price scoring (0-40 points)
-        # Higher ETS price = better for CO₂ reduction projects
-        if site.eu_ets_price >= 80:
-            ets_score = 40
-        elif site.eu_ets_price <= 40:
-            ets_score = 0
-        else:
-            ets_score = ((site.eu_ets_price - 40) / 40) * 40
-        
-        # CBAM applicability (0-30 points)
-        cbam_score = 30 if site.cbam_applicable else 0
-        
-        # Emissions intensity scoring (0-30 points)
-        # Lower intensity = better
-        if site.emissions_intensity <= 200:
-            intensity_score = 30
-        elif site.emissions_intensity >= 800:
-            intensity_score = 0
-        else:
-            intensity_score = 30 - ((site.emissions_intensity - 200) / 600) * 30
-        
-        total_score = ets_score + cbam_score + intensity_score
-        return min(100, max(0, total_score))
+        return float(_policy_scores([site.eu_ets_price], [site.cbam_applicable], [site.emissions_intensity])[0])
     
     def calculate_infrastructure_score(self, site: SiteMetrics) -> float:
         """Calculate infrastructure availability score (0-100)"""
-        # Industrial zone scoring (0-40 points)
-        zone_scores = {
-            'Chemical': 40,
-            'Refinery': 35,
-            'Steel': 30,
-            'Cement': 25,
-            'Power': 20,
-            'Other': 15
-        }
-        zone_score = zone_scores.get(site.industrial_zone, 15)
+        return int(_infrastructure_scores(
+            [site.industrial_zone], [site.utility_availability], [site.transport_access]
+        )[0])
+    
+    def calculate_financial_score(self, site: SiteMetrics) -> float:
+        """Calculate financial viability score (0-100)"""
+        return float(_financial_scores([site.labor_costs], [site.land_costs], [site.tax_incentives])[0])
+    
+    def score_columns(self, columns) -> Tuple[np.ndarray, np.ndarray]:
+        """Score sites given as columns (a dict of arrays or a DataFrame) with column arithmetic
         
-        # Utility availability (0-30 points)
-        utility_scores = {
-            'Excellent': 30,
-            'Good': 25,
-            'Fair': 20,
-            'Poor': 10
-        }
-        utility_score = utility_scores.get(site.utility_availability, 15)
+        Returns the (N, 5) sub-score matrix in SCORE_COMPONENTS order and the weighted totals.
+        """
+        if njit is not None:
+            return _score_kernel(
+                _as_float(columns['co2_volume_tpy']), _as_float(columns['co2_concentration']),
+                _as_float(columns['power_price_eur_mwh']), _as_float(columns['renewable_energy_share']),
+                _as_float(columns['power_availability']), _as_float(columns['eu_ets_price']),
+                np.asarray(columns['cbam_applicable'], dtype=bool), _as_float(columns['emissions_intensity']),
+                _infrastructure_scores(columns['industrial_zone'], columns['utility_availability'], columns['transport_access']),
+                _as_float(columns['labor_costs']), _as_float(columns['land_costs']), _as_float(columns['tax_incentives']),
+                np.array([self.weights[component] for component in SCORE_COMPONENTS], dtype=np.float64)
+            )
         
-        # Transport access (0-30 points)
-        transport_scores = {
-            'Excellent': 30,
-            'Good': 25,
-            'Fair': 20,
-            'Poor': 10
-        }
-        transport_score = transport_scores.get(site.transport_access, 15)
+        # Each component is written straight into its column of the score matrix, and the weighted
+        # total is accumulated in place in component order (matching the scalar evaluation)
+        scores = np.empty((len(columns['site_id']), len(SCORE_COMPONENTS)))
+        scores[:, 0] = _co2_availability_scores(columns['co2_volume_tpy'], columns['co2_concentration'])
+        scores[:, 1] = _energy_scores(columns['power_price_eur_mwh'], columns['renewable_energy_share'], columns['power_availability'])
+        scores[:, 2] = _policy_scores(columns['eu_ets_price'], columns['cbam_applicable'], columns['emissions_intensity'])
+        scores[:, 3] = _infrastructure_scores(columns['industrial_zone'], columns['utility_availability'], columns['transport_access'])
+        scores[:, 4] = _financial_scores(columns['labor_costs'], columns['land_costs'], columns['tax_incentives'])
         
-        total_score = zone_score + utility_score + transport_score
-        return min(100, max(0, total_score))
+        totals = scores[:, 0] * self.weights[SCORE_COMPONENTS[0]]
+        for i in range(1, len(SCORE_COMPONENTS)):
+            totals += scores[:, i] * self.weights[SCORE_COMPONENTS[i]]
+        return scores, totals
     
-    def calculate_financial_score(self, site: SiteMetrics) -> float:
-        """Calculate financial viability score (0-100)"""
-        # Labor cost scoring (0-40 points)
-        # Lower labor costs = higher score
-        if site.labor_costs <= 25:
-            labor_score = 40
-        elif site.labor_costs >= 50:
-            labor_score = 0
-        else:
-            labor_score = 40 - ((site.labor_costs - 25) / 25) * 40
+    def _score_store(self) -> np.ndarray:
+        """Score all sites and write the score columns into the store; returns the weighted totals"""
+        columns = self._site_columns()
+        if not columns:
+            raise ValueError("No sites to evaluate")
+        logger.info(f"Evaluating {len(self)} sites...")
         
-        # Land cost scoring (0-30 points)
-        if site.land_costs <= 100:
-            land_score = 30
-        elif site.land_costs >= 500:
-            land_score = 0
+        scores, totals = self.score_columns(columns)
+        for component_index, component in enumerate(SCORE_COMPONENTS):
+            columns[f'{component}_score'] = scores[:, component_index]
+        # Infrastructure points are whole numbers, so materialized sites get an int score
+        columns['infrastructure_score'] = columns['infrastructure_score'].astype(np.int64)
+        columns['total_score'] = totals
+        self._rows = {}
+        return totals
+    
+    def rank_sites(self) -> np.ndarray:
+        """Score and rank all sites in the store; returns store positions in ranking order"""
+        # Scores written by a partial ranking are still current (any change clears _top)
+        if self._top is not None:
+            totals = self.columns['total_score']
         else:
-            land_score = 30 - ((site.land_costs - 100) / 400) * 30
+            totals = self._score_store()
+        columns = self.columns
         
-        # Tax incentives (0-30 points)
-        incentive_score = min(30, site.tax_incentives * 0.3)
+        # Sort by total score (descending) with a stable argsort over the previous order, so ties
+        # keep their previous ranking (insertion order on the first evaluation)
+        previous_order = self._previous_order()
+        order = previous_order[np.argsort(-totals[previous_order], kind='stable')]
         
-        total_score = labor_score + land_score + incentive_score
-        return min(100, max(0, total_score))
+        # Add rankings
+        ranking = np.empty(len(order), dtype=np.uint32)
+        ranking[order] = np.arange(1, len(order) + 1)
+        columns['ranking'] = ranking
+        self._order = order
+        self._dirty = False
+        self._top = None
+        self._rows = {}
+        
+        logger.info(f"Site evaluation complete. Top site: {columns['name'][order[0]]} (Score: {totals[order[0]]:.1f})")
+        return order
     
-    def evaluate_sites(self) -> List[SiteMetrics]:
-        """Evaluate all sites and return ranked list"""
-        logger.info(f"Evaluating {len(self.sites)} sites...")
+    def _rank_top(self, n: int) -> Optional[np.ndarray]:
+        """Score all sites but rank only the best n (0 < n < number of sites)
         
-        for site in self.sites:
-            # Calculate individual scores
-            site.co2_availability_score = self.calculate_co2_score(site)
-            site.energy_score = self.calculate_energy_score(site)
-            site.policy_score = self.calculate_policy_score(site)
-            site.infrastructure_score = self.calculate_infrastructure_score(site)
-            site.financial_score = self.calculate_financial_score(site)
-            
-            # Calculate weighted total score
-            site.total_score = (
-                site.co2_availability_score * self.weights['co2_availability'] +
-                site.energy_score * self.weights['energy'] +
-                site.policy_score * self.weights['policy'] +
-                site.infrastructure_score * self.weights['infrastructure'] +
-                site.financial_score * self.weights['financial']
-            )
+        Returns the same first n positions as rank_sites, or None if fewer than n sites have a
+        score. Only those n sites get a ranking; the rest is finished by rank_sites as soon as the
+        full order is needed (sites, filter_sites, export_results).
+        """
+        totals = self._score_store()
+        columns = self.columns
         
-        # Sort by total score (descending)
-        self.sites.sort(key=lambda x: x.total_score, reverse=True)
+        # Every site scoring at least the n-th best total (boundary ties included) is a candidate;
+        # a stable sort of the candidates over the current order then matches the full ranking
+        keys = -totals
+        threshold = np.partition(keys, n - 1)[n - 1]
+        if np.isnan(threshold):
+            return None
+        previous_order = self._previous_order()
+        candidates = previous_order[keys[previous_order] <= threshold]
+        top = candidates[np.argsort(keys[candidates], kind='stable')][:n]
         
-        # Add rankings
-        for i, site in enumerate(self.sites):
-            site.ranking = i + 1
+        ranking = np.zeros(len(totals), dtype=np.uint32)
+        ranking[top] = np.arange(1, n + 1)
+        columns['ranking'] = ranking
+        self._top = top
         
-        logger.info(f"Site evaluation complete. Top site: {self.sites[0].name} (Score: {self.sites[0].total_score:.1f})")
+        logger.info(f"Site evaluation complete. Top site: {columns['name'][top[0]]} (Score: {totals[top[0]]:.1f})")
+        return top
+    
+    def evaluate_sites(self) -> List[SiteMetrics]:
+        """Evaluate all sites and return ranked list"""
+        self.rank_sites()
         return self.sites
     
     def get_top_sites(self, n: int = 5) -> List[SiteMetrics]:
         """Get top N ranked sites"""
-        if not self.sites:
-            self.evaluate_sites()
-        return self.sites[:n]
+        if self._dirty:
+            # Select the top n in linear time unless a partial ranking already covers them
+            if self._top is not None and 0 < n <= len(self._top):
+                return [self.row(index) for index in self._top[:n]]
+            if 0 < n < len(self):
+                top = self._rank_top(n)
+                if top is not None:
+                    return [self.row(index) for index in top]
+            self.rank_sites()
+        return [self.row(index) for index in self._order[:n]]
     
     def filter_sites(self, 
                     min_co2_volume: Optional[float] = None,
@@ -244,47 +517,35 @@ class SiteScreeningEngine:
                     countries: Optional[List[str]] = None,
                     min_score: Optional[float] = None) -> List[SiteMetrics]:
         """Filter sites based on criteria"""
-        filtered = self.sites
+        columns = self._site_columns()
+        order = self._current_order()
+        if not len(order):
+            return []
+        mask = np.ones(len(order), dtype=bool)
         
         if min_co2_volume:
-            filtered = [s for s in filtered if s.co2_volume_tpy >= min_co2_volume]
+            mask &= columns['co2_volume_tpy'][order] >= min_co2_volume
         
         if max_power_price:
-            filtered = [s for s in filtered if s.power_price_eur_mwh <= max_power_price]
+            mask &= columns['power_price_eur_mwh'][order] <= max_power_price
         
         if countries:
-            filtered = [s for s in filtered if s.country in countries]
+            mask &= np.isin(columns['country'][order], countries)
         
         if min_score:
-            filtered = [s for s in filtered if s.total_score >= min_score]
+            mask &= columns['total_score'][order] >= min_score
         
-        return filtered
+        return [self.row(index) for index in order[mask]]
     
     def export_results(self, filename: str = "site_screening_results.csv") -> None:
         """Export screening results to CSV"""
-        if not self.sites:
-            self.evaluate_sites()
-        
-        # Convert to DataFrame
-        data = []
-        for site in self.sites:
-            data.append({
-                'Ranking': site.ranking,
-                'Name': site.name,
-                'Country': site.country,
-                'Total_Score': site.total_score,
-                'CO2_Score': site.co2_availability_score,
-                'Energy_Score': site.energy_score,
-                'Policy_Score': site.policy_score,
-                'Infrastructure_Score': site.infrastructure_score,
-                'Financial_Score': site.financial_score,
-                'CO2_Volume_TPY': site.co2_volume_tpy,
-                'Power_Price_EUR_MWh': site.power_price_eur_mwh,
-                'EU_ETS_Price': site.eu_ets_price,
-                'Emissions_Intensity': site.emissions_intensity
-            })
+        if self._dirty:
+            self.rank_sites()
         
-        df = pd.DataFrame(data)
+        # Convert to DataFrame straight from the columns, gathered once into ranking order
+        columns = self.columns
+        order = self._order
+        df = pd.DataFrame({header: columns[name][order] for name, header in _EXPORT_COLUMNS.items()}, copy=False)
         df.to_csv(filename, index=False)
         logger.info(f"Results exported to {filename}")
 
@@ -326,8 +587,7 @@ if __name__ == "__main__":
         }
     ]
     
-    for site_data in sample_sites:
-        engine.add_site(site_data)
+    engine.add_sites(sample_sites)
     
     # Evaluate and get results
     results = engine.evaluate_sites()
@@ -6,6 +6,7 @@ Helps configure the GROQ_API_KEY environment variable
 
 import os
 import sys
+import functools
 
 def setup_groq():
     """Setup Groq API key"""
@@ -42,27 +43,34 @@ def setup_groq():
     
     return False
 
+@functools.lru_cache(maxsize=1)
+def _get_client(api_key: str):
+    """Groq client for api_key, created once and reused across connection tests"""
+    from groq import Groq
+    return Groq(api_key=api_key)
+
 def test_groq_connection():
     """Test Groq API connection"""
     try:
-        from groq import Groq
-        
         api_key = os.getenv('GROQ_API_KEY')
         if not api_key:
             print("❌ GROQ_API_KEY not found")
             return False
         
-        client = Groq(api_key=api_key)
+        client = _get_client(api_key)
         
-        # Test with a simple request
+        # Liveness check: a single deterministic token is enough
         response = client.chat.completions.create(
-            messages=[{"role": "user", "content": "Hello"}],
+            messages=[{"role": "user", "content": "ping"}],
             model="llama-3.1-8b-instant",
-            max_tokens=10
+            max_tokens=1,
+            temperature=0
         )
         
         print("✅ Groq API connection successful!")
         print(f"Response: {response.choices[0].message.content}")
+        if response.usage is not None:
+            print(f"Usage: {response.usage.total_tokens} tokens")
         return True
         
     except Exception as e:
@@ -0,0 +1,95 @@
+"""
+Regression tests for the FinancialModel metric kernels
+"""
+
+import logging
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+import financial_modeling
+from financial_modeling import FinancialModel, ProjectParameters
+
+logging.disable(logging.CRITICAL)
+
+def py_func(kernel):
+    """Plain-Python version of a kernel, whether or not numba compiled it"""
+    return getattr(kernel, 'py_func', kernel)
+
+def random_projects(n_projects: int, seed: int = 0) -> pd.DataFrame:
+    """Sweep parameters covering profitable, marginal and loss-making projects"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'total_capex': rng.uniform(1e6, 1e8, n_projects),
+        'total_opex': rng.uniform(1e5, 5e6, n_projects),
+        'total_revenue': rng.uniform(1e5, 2e7, n_projects),
+        'discount_rate': rng.uniform(0.02, 0.15, n_projects),
+        'project_lifetime_years': rng.integers(1, 40, n_projects),
+        'construction_period_years': rng.integers(1, 5, n_projects),
+        'ramp_up_period_years': rng.integers(0, 4, n_projects)
+    })
+
+def make_model(equipment_cost: float, co_price: float) -> FinancialModel:
+    """Model with CAPEX, OPEX and revenue filled in"""
+    model = FinancialModel(ProjectParameters('Pilot', 'Site', 100, 50))
+    model.cost_structure = model.calculate_capex(equipment_cost)
+    model.calculate_opex(75, 2.5, 5, 2, 10, 35)
+    model.calculate_revenue(co_price)
+    return model
+
+class MetricKernelTest(unittest.TestCase):
+
+    def test_irr_kernel_matches_estimate_irr(self):
+        net_cash_flow_kernel = py_func(financial_modeling._net_cash_flow_kernel)
+        irr_kernel = py_func(financial_modeling._irr_kernel)
+        model = make_model(2e6, 800)
+
+        for row in random_projects(500).itertuples():
+            net = net_cash_flow_kernel(
+                row.total_capex, row.total_opex, row.total_revenue, row.project_lifetime_years,
+                row.construction_period_years, row.ramp_up_period_years
+            )
+            self.assertAlmostEqual(irr_kernel(net), model._estimate_irr(net), places=6)
+
+    def test_cash_flow_metrics_kernel_matches_numpy_path(self):
+        cash_flow_metrics_kernel = py_func(financial_modeling._cash_flow_metrics_kernel)
+
+        for equipment_cost, co_price in ((2e6, 800), (5e6, 300), (9e6, 100)):
+            model = make_model(equipment_cost, co_price)
+            with mock.patch.object(financial_modeling, 'njit', None):
+                metrics = model.calculate_financial_metrics()
+
+            npv, irr, payback = cash_flow_metrics_kernel(
+                model.cash_flow_projection.net_cash_flow, model.project_params.discount_rate
+            )
+            self.assertAlmostEqual(npv, metrics['npv_eur'], delta=1e-6 * model.cost_structure.total_capex)
+            self.assertAlmostEqual(irr, metrics['irr_percent'], places=6)
+            self.assertEqual(payback, metrics['payback_period_years'])
+
+    def test_batch_metrics_kernel_matches_vectorized_path(self):
+        params_df = random_projects(300, seed=1)
+        with mock.patch.object(financial_modeling, 'njit', None):
+            expected = FinancialModel.batch_metrics(params_df)
+
+        npv, irr, payback, roi = py_func(financial_modeling._batch_metrics_kernel)(
+            params_df['total_capex'].to_numpy(),
+            params_df['total_opex'].to_numpy(),
+            params_df['total_revenue'].to_numpy(),
+            params_df['project_lifetime_years'].to_numpy(),
+            params_df['construction_period_years'].to_numpy(),
+            params_df['ramp_up_period_years'].to_numpy(),
+            params_df['discount_rate'].to_numpy()
+        )
+        np.testing.assert_allclose(npv, expected['npv_eur'], rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(irr, expected['irr_percent'], atol=1e-6)
+        np.testing.assert_array_equal(payback, expected['payback_period_years'])
+        np.testing.assert_allclose(roi, expected['annual_roi_percent'])
+
+if __name__ == '__main__':
+    unittest.main()
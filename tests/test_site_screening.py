@@ -0,0 +1,90 @@
+"""
+Regression tests for SiteScreeningEngine ranking state
+"""
+
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from site_screening import SiteScreeningEngine, CATEGORICAL_FIELDS
+
+SAMPLE_SITES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend', 'data', 'sample_sites.csv')
+
+ENERGY_ONLY_WEIGHTS = {
+    'co2_availability': 0.0,
+    'energy': 1.0,
+    'policy': 0.0,
+    'infrastructure': 0.0,
+    'financial': 0.0
+}
+
+def make_engine(weights=None) -> SiteScreeningEngine:
+    """Engine loaded with the sample sites"""
+    engine = SiteScreeningEngine()
+    if weights is not None:
+        engine.weights = weights
+    engine.add_sites_frame(pd.read_csv(
+        SAMPLE_SITES_PATH,
+        dtype={'site_id': str, **{column: 'category' for column in CATEGORICAL_FIELDS}}
+    ))
+    return engine
+
+def names(sites):
+    return [site.name for site in sites]
+
+class WeightsTest(unittest.TestCase):
+
+    def test_weights_cannot_be_mutated_in_place(self):
+        engine = make_engine()
+        with self.assertRaises(TypeError):
+            engine.weights['energy'] = 1.0
+
+    def test_reassigned_weights_rerank_top_sites(self):
+        engine = make_engine()
+        default_top = names(engine.get_top_sites(3))
+
+        engine.weights = {**engine.weights, **ENERGY_ONLY_WEIGHTS}
+        expected = names(make_engine(ENERGY_ONLY_WEIGHTS).evaluate_sites()[:3])
+
+        self.assertEqual(names(engine.get_top_sites(3)), expected)
+        self.assertNotEqual(expected, default_top)
+
+    def test_caller_dict_changes_do_not_leak_into_weights(self):
+        weights = dict(ENERGY_ONLY_WEIGHTS)
+        engine = make_engine(weights)
+        top = names(engine.get_top_sites(3))
+
+        weights['energy'] = 0.0
+        weights['co2_availability'] = 1.0
+        self.assertEqual(engine.weights['energy'], 1.0)
+        self.assertEqual(names(engine.get_top_sites(3)), top)
+
+class PartialRankingTest(unittest.TestCase):
+
+    def test_sites_agree_with_top_sites_after_partial_ranking(self):
+        engine = make_engine()
+        engine.rank_sites()
+        engine.weights = ENERGY_ONLY_WEIGHTS
+
+        top = names(engine.get_top_sites(2))
+        sites = engine.sites
+
+        self.assertEqual(names(sites[:2]), top)
+        self.assertEqual([site.ranking for site in sites], list(range(1, len(sites) + 1)))
+        self.assertEqual(names(sites), names(make_engine(ENERGY_ONLY_WEIGHTS).evaluate_sites()))
+
+    def test_filter_sites_uses_full_ranking_after_partial_ranking(self):
+        engine = make_engine()
+        engine.weights = ENERGY_ONLY_WEIGHTS
+        top = names(engine.get_top_sites(2))
+
+        filtered = engine.filter_sites(min_score=0.01)
+        self.assertEqual(names(filtered[:2]), top)
+        self.assertTrue(all(site.ranking > 0 for site in filtered))
+
+if __name__ == '__main__':
+    unittest.main()